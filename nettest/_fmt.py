@@ -0,0 +1,23 @@
+"""Human-readable byte and bit-rate formatting shared by the report tables."""
+
+from bisect import bisect_right
+
+# Human-readable size units and their divisors
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_BYTE_SCALES = tuple(1 << (10 * i) for i in range(len(_BYTE_UNITS)))
+_BIT_UNITS = ("bps", "Kbps", "Mbps", "Gbps", "Tbps")
+_BIT_SCALES = (1, 1e3, 1e6, 1e9, 1e12)
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Format bytes into human-readable string, e.g. "1.50 MB"."""
+    # Largest unit whose divisor does not exceed the value (B below 1 KB)
+    i = max(0, bisect_right(_BYTE_SCALES, abs(num_bytes)) - 1)
+    return f"{num_bytes / _BYTE_SCALES[i]:.2f} {_BYTE_UNITS[i]}"
+
+
+def format_bits(bits: float) -> str:
+    """Format bits into human-readable string, e.g. "12.00 Mbps"."""
+    # Largest unit whose divisor does not exceed the value (bps below 1 Kbps)
+    i = max(0, bisect_right(_BIT_SCALES, abs(bits)) - 1)
+    return f"{bits / _BIT_SCALES[i]:.2f} {_BIT_UNITS[i]}"
@@ -4,21 +4,66 @@ This module provides tools to analyze and compare test results
 across multiple runs, scenarios, and parameter sweeps.
 """
 
+import csv
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 
-console = Console()
+from ._fmt import format_bits
 
+console = Console()
 
-@dataclass
+# Result files above this size are read into a pre-sized buffer
+_LARGE_FILE_BYTES = 1 << 20
+
+# Upper bound on threads used to load result files in parallel
+_LOAD_WORKERS = 8
+
+# CSV export columns as (header, sweep result key) pairs
+_CSV_COLUMNS = (
+    ("num_clients", "num_clients"),
+    ("total_flows", "total_flows"),
+    ("successful_flows", "successful_flows"),
+    ("success_rate_pct", "success_rate"),
+    ("total_bytes", "total_bytes"),
+    ("total_throughput_bps", "total_throughput_bps"),
+    ("per_client_throughput_bps", "throughput_per_client_bps"),
+    ("retransmits", "total_retransmits"),
+    ("packet_loss_pct", "packet_loss_pct"),
+    ("mice_flows", "mice_flows"),
+    ("elephant_flows", "elephant_flows"),
+)
+_CSV_HEADER = [header for header, _ in _CSV_COLUMNS]
+_CSV_KEYS = tuple(key for _, key in _CSV_COLUMNS)
+_CSV_BUFFER_BYTES = 1 << 20
+
+# Success rate (%) below which a sweep point counts as the breaking point
+_BREAKING_POINT_THRESHOLD = 90
+
+# Columns of the per-sweep table in compare_sweeps as (header, justify)
+_SWEEP_COLS = (
+    ("Clients", "right"),
+    ("Success %", "right"),
+    ("Throughput", "right"),
+    ("Retransmits", "right"),
+)
+
+
+@dataclass(slots=True, frozen=True)
 class RunSummary:
-    """Summary of a single test run."""
+    """Summary of a single test run.
+
+    Summaries are immutable and hashable, so they can be used as dict keys
+    or set members.
+    """
 
     filename: str
     timestamp: str
@@ -32,45 +77,119 @@ class RunSummary:
     packet_loss_pct: float
 
 
+@lru_cache(maxsize=256)
+def _load_json_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    """Parse a JSON file, memoized on its path, mtime and size.
+
+    The stat fields are part of the cache key so a rewritten file is
+    re-parsed. Callers must treat the returned dict as read-only.
+    """
+    if size > _LARGE_FILE_BYTES:
+        # Large sweeps: read straight into a buffer sized from the stat
+        # result rather than letting read() probe for EOF and regrow
+        buf = bytearray(size)
+        with open(path_str, "rb", buffering=0) as f:
+            # A single read may return short (signals, network filesystems,
+            # the ~2 GiB per-call cap), so keep filling until EOF
+            n = 0
+            with memoryview(buf) as view:
+                while n < size:
+                    got = f.readinto(view[n:])
+                    if not got:
+                        break
+                    n += got
+            if n == size and not f.read(1):
+                return json.loads(buf)
+            # The file changed size since the stat; read whatever is there now
+            f.seek(0)
+            return json.loads(f.readall())
+    # json.loads decodes bytes itself, skipping the text-mode reader layer
+    return json.loads(Path(path_str).read_bytes())
+
+
+def _load_json(filepath: Path) -> dict:
+    """Load a JSON file through the parse cache."""
+    st = filepath.stat()
+    return _load_json_cached(str(filepath), st.st_mtime_ns, st.st_size)
+
+
 def load_sweep_result(filepath: Path) -> dict:
     """Load a sweep result JSON file."""
-    with open(filepath) as f:
-        return json.load(f)
+    return _load_json(filepath)
 
 
 def load_test_result(filepath: Path) -> dict:
     """Load a single test result JSON file."""
-    with open(filepath) as f:
-        return json.load(f)
+    return _load_json(filepath)
+
+
+def _scan_results(results_dir: Path) -> tuple[list[Path], list[Path]]:
+    """Scan a results directory once, splitting out the sweep files.
+
+    Returns:
+        Tuple of (all result files, sweep result files), newest name first
+    """
+    all_results = []
+    sweeps = []
+    try:
+        with os.scandir(results_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not name.endswith(".json"):
+                    continue
+                path = Path(entry.path)
+                all_results.append(path)
+                if name.startswith("sweep_"):
+                    sweeps.append(path)
+    except OSError:
+        return [], []
+
+    all_results.sort(reverse=True)
+    sweeps.sort(reverse=True)
+    return all_results, sweeps
 
 
 def list_results(results_dir: Path = Path("results")) -> list[Path]:
     """List all result files in a directory."""
-    if not results_dir.exists():
-        return []
-    return sorted(results_dir.glob("*.json"), reverse=True)
+    return _scan_results(results_dir)[0]
 
 
 def list_sweep_results(results_dir: Path = Path("results")) -> list[Path]:
     """List all sweep result files."""
-    if not results_dir.exists():
-        return []
-    return sorted(results_dir.glob("sweep_*.json"), reverse=True)
+    return _scan_results(results_dir)[1]
+
+
+def _try_load_test_result(filepath: Path) -> Optional[dict]:
+    """Load a test result, returning None if it can't be read or parsed."""
+    try:
+        return load_test_result(filepath)
+    except Exception:
+        return None
 
 
 def summarize_results(results_dir: Path = Path("results")) -> list[RunSummary]:
     """Generate summaries of all test results."""
     summaries = []
+    paths = list_results(results_dir)
+    if not paths:
+        return summaries
 
-    for filepath in list_results(results_dir):
+    # Overlap the file reads across a few threads; summaries are still
+    # built in order on this thread
+    with ThreadPoolExecutor(max_workers=min(_LOAD_WORKERS, len(paths))) as pool:
+        loaded = list(pool.map(_try_load_test_result, paths))
+
+    for filepath, data in zip(paths, loaded):
+        if data is None:
+            continue
         try:
-            data = load_test_result(filepath)
             summary = data.get("summary", {})
             aggregate = summary.get("aggregate", {})
+            total_flows = aggregate.get("total_flows", 0)
+            successful_flows = aggregate.get("successful_flows", 0)
 
             # Try to extract client count from name
             num_clients = None
-            flows = data.get("flows", [])
 
             summaries.append(
                 RunSummary(
@@ -79,11 +198,9 @@ def summarize_results(results_dir: Path = Path("results")) -> list[RunSummary]:
                     name=filepath.stem,
                     num_clients=num_clients,
                     duration=summary.get("test_duration_seconds", 0),
-                    total_flows=aggregate.get("total_flows", 0),
+                    total_flows=total_flows,
                     success_rate=(
-                        aggregate.get("successful_flows", 0) / aggregate.get("total_flows", 1) * 100
-                        if aggregate.get("total_flows", 0) > 0
-                        else 0
+                        successful_flows / total_flows * 100 if total_flows > 0 else 0
                     ),
                     throughput_bps=aggregate.get("average_throughput_bps", 0),
                     retransmits=aggregate.get("total_retransmits", 0),
@@ -96,29 +213,34 @@ def summarize_results(results_dir: Path = Path("results")) -> list[RunSummary]:
     return summaries
 
 
+def _new_sweep_table() -> Table:
+    """Create an empty per-sweep comparison table."""
+    table = Table(show_header=True)
+    for header, justify in _SWEEP_COLS:
+        table.add_column(header, justify=justify)
+    return table
+
+
 def compare_sweeps(sweep_files: list[Path]) -> None:
     """Compare multiple sweep results."""
     if not sweep_files:
         console.print("[yellow]No sweep files to compare[/yellow]")
         return
 
-    console.print("\n[bold cyan]Sweep Comparison[/bold cyan]\n")
+    # Collect everything and print once, so rich lays out and writes the
+    # whole comparison in a single pass instead of per line
+    renderables = ["\n[bold cyan]Sweep Comparison[/bold cyan]\n"]
 
     for filepath in sweep_files:
         try:
             data = load_sweep_result(filepath)
-            console.print(f"[bold]{data.get('sweep_name', 'Unnamed')}[/bold]")
-            console.print(f"  File: {filepath.name}")
-            console.print(f"  Timestamp: {data.get('timestamp', 'Unknown')}")
+            renderables.append(f"[bold]{data.get('sweep_name', 'Unnamed')}[/bold]")
+            renderables.append(f"  File: {filepath.name}")
+            renderables.append(f"  Timestamp: {data.get('timestamp', 'Unknown')}")
 
             results = data.get("results", [])
             if results:
-                table = Table(show_header=True)
-                table.add_column("Clients", justify="right")
-                table.add_column("Success %", justify="right")
-                table.add_column("Throughput", justify="right")
-                table.add_column("Retransmits", justify="right")
-
+                table = _new_sweep_table()
                 for r in results:
                     success_rate = r.get("success_rate", 0)
                     success_style = (
@@ -127,15 +249,46 @@ def compare_sweeps(sweep_files: list[Path]) -> None:
                     table.add_row(
                         str(r.get("num_clients", "?")),
                         f"[{success_style}]{success_rate:.1f}%[/{success_style}]",
-                        _format_bits(r.get("total_throughput_bps", 0)) + "/s",
+                        format_bits(r.get("total_throughput_bps", 0)) + "/s",
                         str(r.get("total_retransmits", 0)),
                     )
 
-                console.print(table)
-            console.print()
+                renderables.append(table)
+            renderables.append("")
 
         except Exception as e:
-            console.print(f"[red]Error loading {filepath}: {e}[/red]")
+            renderables.append(f"[red]Error loading {filepath}: {e}[/red]")
+
+    console.print(Group(*renderables))
+
+
+def _analyze_single_point(sweep_name: str, r: dict) -> dict:
+    """Build the analyze_sweep result for a sweep with a single point.
+
+    A lone point has no breaking point or scaling trend, so the loop over
+    the sweep is skipped. The returned dict matches the general path.
+    """
+    clients = r.get("num_clients")
+    per_client = r.get("throughput_per_client_bps", 0)
+    return {
+        "sweep_name": sweep_name,
+        "total_scenarios": 1,
+        "client_range": [clients, clients],
+        "peak_throughput": {
+            "value_bps": r.get("total_throughput_bps", 0),
+            "at_clients": clients,
+        },
+        "breaking_point": {
+            "clients": None,
+            "threshold": _BREAKING_POINT_THRESHOLD,
+            "detected": False,
+        },
+        "per_client_throughput": {
+            "first": per_client,
+            "last": per_client,
+            "change_pct": 0.0,
+        },
+    }
 
 
 def analyze_sweep(filepath: Path) -> dict:
@@ -150,31 +303,37 @@ def analyze_sweep(filepath: Path) -> dict:
     if not results:
         return {"error": "No results in sweep"}
 
+    if len(results) == 1:
+        return _analyze_single_point(data.get("sweep_name", "Unknown"), results[0])
+
     analysis = {
         "sweep_name": data.get("sweep_name", "Unknown"),
         "total_scenarios": len(results),
         "client_range": [results[0].get("num_clients"), results[-1].get("num_clients")],
     }
 
-    # Find peak throughput
-    peak_throughput = max(r.get("total_throughput_bps", 0) for r in results)
-    peak_client = next(
-        r.get("num_clients")
-        for r in results
-        if r.get("total_throughput_bps", 0) == peak_throughput
-    )
+    # Peak throughput and breaking point (where success rate drops below
+    # threshold) are found in a single walk over the sweep points
+    threshold = _BREAKING_POINT_THRESHOLD
+    peak_throughput = None
+    peak_client = None
+    breaking_index = None
+    for i, r in enumerate(results):
+        throughput = r.get("total_throughput_bps", 0)
+        if peak_throughput is None or throughput > peak_throughput:
+            peak_throughput = throughput
+            peak_client = r.get("num_clients")
+        if breaking_index is None and i > 0 and r.get("success_rate", 100) < threshold:
+            breaking_index = i
+
     analysis["peak_throughput"] = {
         "value_bps": peak_throughput,
         "at_clients": peak_client,
     }
 
-    # Find breaking point (where success rate drops below threshold)
-    threshold = 90
     breaking_point = None
-    for i, r in enumerate(results):
-        if r.get("success_rate", 100) < threshold and i > 0:
-            breaking_point = results[i - 1].get("num_clients")
-            break
+    if breaking_index is not None:
+        breaking_point = results[breaking_index - 1].get("num_clients")
 
     analysis["breaking_point"] = {
         "clients": breaking_point,
@@ -182,35 +341,33 @@ def analyze_sweep(filepath: Path) -> dict:
         "detected": breaking_point is not None,
     }
 
+    first = results[0]
+    last = results[-1]
+
     # Calculate scaling efficiency
-    if len(results) >= 2:
-        first = results[0]
-        last = results[-1]
-        if first.get("total_throughput_bps", 0) > 0:
-            scaling = last.get("total_throughput_bps", 0) / first.get("total_throughput_bps", 1)
-            client_ratio = last.get("num_clients", 1) / first.get("num_clients", 1)
-            efficiency = (scaling / client_ratio) * 100
-
-            analysis["scaling"] = {
-                "throughput_ratio": scaling,
-                "client_ratio": client_ratio,
-                "efficiency_pct": efficiency,
-            }
+    if first.get("total_throughput_bps", 0) > 0:
+        scaling = last.get("total_throughput_bps", 0) / first.get("total_throughput_bps", 1)
+        client_ratio = last.get("num_clients", 1) / first.get("num_clients", 1)
+        efficiency = (scaling / client_ratio) * 100
+
+        analysis["scaling"] = {
+            "throughput_ratio": scaling,
+            "client_ratio": client_ratio,
+            "efficiency_pct": efficiency,
+        }
 
     # Per-client metrics trend
-    per_client_throughput = [
-        r.get("throughput_per_client_bps", 0) for r in results
-    ]
-    if per_client_throughput:
-        analysis["per_client_throughput"] = {
-            "first": per_client_throughput[0],
-            "last": per_client_throughput[-1],
-            "change_pct": (
-                (per_client_throughput[-1] - per_client_throughput[0]) / per_client_throughput[0] * 100
-                if per_client_throughput[0] > 0
-                else 0
-            ),
-        }
+    first_per_client = first.get("throughput_per_client_bps", 0)
+    last_per_client = last.get("throughput_per_client_bps", 0)
+    analysis["per_client_throughput"] = {
+        "first": first_per_client,
+        "last": last_per_client,
+        "change_pct": (
+            (last_per_client - first_per_client) / first_per_client * 100
+            if first_per_client > 0
+            else 0
+        ),
+    }
 
     return analysis
 
@@ -224,7 +381,7 @@ def print_analysis(analysis: dict) -> None:
     if "peak_throughput" in analysis:
         peak = analysis["peak_throughput"]
         console.print(
-            f"\n[green]Peak Throughput:[/green] {_format_bits(peak['value_bps'])}/s "
+            f"\n[green]Peak Throughput:[/green] {format_bits(peak['value_bps'])}/s "
             f"at {peak['at_clients']} clients"
         )
 
@@ -252,8 +409,8 @@ def print_analysis(analysis: dict) -> None:
         change = pct["change_pct"]
         change_color = "green" if change >= -10 else "yellow" if change >= -30 else "red"
         console.print(f"\n[bold]Per-Client Throughput:[/bold]")
-        console.print(f"  First: {_format_bits(pct['first'])}/s")
-        console.print(f"  Last: {_format_bits(pct['last'])}/s")
+        console.print(f"  First: {format_bits(pct['first'])}/s")
+        console.print(f"  Last: {format_bits(pct['last'])}/s")
         console.print(f"  Change: [{change_color}]{change:+.1f}%[/{change_color}]")
 
 
@@ -266,49 +423,9 @@ def export_sweep_csv(filepath: Path, output: Path) -> None:
         console.print("[yellow]No results to export[/yellow]")
         return
 
-    import csv
-
-    with open(output, "w", newline="") as f:
+    with open(output, "w", newline="", buffering=_CSV_BUFFER_BYTES) as f:
         writer = csv.writer(f)
-
-        # Header
-        writer.writerow([
-            "num_clients",
-            "total_flows",
-            "successful_flows",
-            "success_rate_pct",
-            "total_bytes",
-            "total_throughput_bps",
-            "per_client_throughput_bps",
-            "retransmits",
-            "packet_loss_pct",
-            "mice_flows",
-            "elephant_flows",
-        ])
-
-        # Data rows
-        for r in results:
-            writer.writerow([
-                r.get("num_clients", 0),
-                r.get("total_flows", 0),
-                r.get("successful_flows", 0),
-                r.get("success_rate", 0),
-                r.get("total_bytes", 0),
-                r.get("total_throughput_bps", 0),
-                r.get("throughput_per_client_bps", 0),
-                r.get("total_retransmits", 0),
-                r.get("packet_loss_pct", 0),
-                r.get("mice_flows", 0),
-                r.get("elephant_flows", 0),
-            ])
+        writer.writerow(_CSV_HEADER)
+        writer.writerows([r.get(key, 0) for key in _CSV_KEYS] for r in results)
 
     console.print(f"[green]Exported to: {output}[/green]")
-
-
-def _format_bits(bits: float) -> str:
-    """Format bits into human-readable string."""
-    for unit in ["bps", "Kbps", "Mbps", "Gbps"]:
-        if abs(bits) < 1000.0:
-            return f"{bits:.2f} {unit}"
-        bits /= 1000.0
-    return f"{bits:.2f} Tbps"
@@ -1,49 +1,245 @@
 """Command-line interface for the network testing suite."""
 
 import argparse
-import asyncio
+import atexit
+import heapq
+import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-import yaml
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
-from .orchestrator import TestOrchestrator
-from .server import ServerPool
-from .results import ResultsCollector
-from .emulation import (
-    NetworkEmulator,
-    NetworkEnvironment,
-    get_default_interface,
-    list_interfaces,
-    list_presets,
-    get_preset,
-)
-from .scenarios import ScenarioRunner, ScenarioConfig
-from .analysis import (
-    list_results,
-    list_sweep_results,
-    summarize_results,
-    analyze_sweep,
-    print_analysis,
-    compare_sweeps,
-    export_sweep_csv,
-)
+# Subsystem imports (asyncio, yaml, orchestrator, server, emulation,
+# scenarios, analysis) are deferred to the handlers that need them so
+# each command only loads its own dependencies
+if TYPE_CHECKING:
+    from .emulation import NetworkEnvironment
 
 console = Console()
 
+# Shared asyncio.Runner for _run_async, created on first use
+_runner = None
+
+# Files smaller than this are read with the default buffer; larger ones
+# (e.g. sweep results) with a 1 MiB buffer to cut read() calls
+_SMALL_FILE_BYTES = 64 * 1024
+_LARGE_READ_BUFFER = 1 << 20
+
+# Suffixes of the YAML files picked up by the listing commands
+_YAML_SUFFIXES = (".yaml", ".yml")
+
+# Client counts in --clients, e.g. "10,20,30" or "10, 20, 30"; the whole
+# argument must match _CLIENT_COUNTS_ARG_RE before the counts are extracted
+_CLIENT_COUNTS_ARG_RE = re.compile(r"\s*\d+(?:\s*,\s*\d+)*\s*")
+_CLIENT_COUNT_RE = re.compile(r"\d+")
+
+# Listing table columns as (header, style)
+_PRESET_COLUMNS = (("Name", "cyan"), ("Description", None))
+_SCENARIO_COLUMNS = (("File", "cyan"), ("Name", None), ("Client Counts", None))
+_SWEEP_COLUMNS = (("File", "cyan"), ("Timestamp", None), ("Scenarios", None))
+
+# Upper bound on threads used to read files for the listing commands
+_LIST_WORKERS = 8
+
+# A plain top-level mapping key at column 0, e.g. "name:" or "client_counts:"
+_TOP_LEVEL_KEY_RE = re.compile(r"([A-Za-z_][\w-]*)[ \t]*:")
+# The top-level "name:" line of an environment file
+_NAME_LINE_RE = re.compile(r"name[ \t]*:")
+# First characters of lines that can't start a new top-level key: nested
+# content, comments, blank lines, indentless sequence items and "---"
+_NON_KEY_STARTS = frozenset(("", " ", "\t", "#", "\n", "\r", "-"))
+
+
+def _buffered_output(func):
+    """Buffer a handler's console output and write it out in one go.
+
+    Listing commands print many short lines; rich holds them in its
+    buffer while the handler runs and flushes once on exit, including
+    when the handler calls sys.exit().
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with console:
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _install_pidfd_child_watcher(asyncio) -> None:
+    """Reap child processes through pidfds on Python 3.10 and 3.11.
+
+    The default ThreadedChildWatcher there starts a thread per
+    subprocess just to wait on it, which adds up with hundreds of
+    servers or a high mice-flow rate. PidfdChildWatcher polls one fd
+    per child on the event loop instead. Python 3.12+ already picks it
+    by default, and older kernels without pidfd_open keep the default.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return
+
+    # set_event_loop() in asyncio.run/Runner attaches it to the new loop
+    asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
+@lru_cache(maxsize=None)
+def _event_loop_factory():
+    """Pick the event loop once per process.
+
+    Uses uvloop when it is installed (installed as the loop policy on
+    Python 3.10, which has no Runner to pass a factory to); otherwise sets
+    up the pidfd child watcher where it applies.
+
+    Returns:
+        uvloop.new_event_loop, or None for the default asyncio loop
+    """
+    import asyncio
+
+    try:
+        import uvloop
+    except ImportError:
+        _install_pidfd_child_watcher(asyncio)
+        return None
+
+    if not hasattr(asyncio, "Runner"):
+        uvloop.install()
+    return uvloop.new_event_loop
+
+
+def _run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    On Python 3.11+ every call shares one asyncio.Runner, so scripts that
+    invoke several commands reuse a single event loop. The runner is
+    closed at exit, which cancels leftover tasks and shuts down async
+    generators. Python 3.10 has no Runner, so each call starts a fresh
+    loop with asyncio.run(); the loop choice is still made only once.
+    """
+    global _runner
+    import asyncio
+
+    loop_factory = _event_loop_factory()
+    if not hasattr(asyncio, "Runner"):
+        return asyncio.run(coro)
+
+    if _runner is None:
+        _runner = asyncio.Runner(loop_factory=loop_factory)
+        atexit.register(_runner.close)
+
+    return _runner.run(coro)
+
+
+def _load_yaml(stream):
+    """Parse YAML with the libyaml-backed loader when PyYAML was built with it."""
+    import yaml
+
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _load_yaml_file(path: Path):
+    """Load a YAML file, giving larger files a bigger read buffer."""
+    # The loader decodes bytes itself; only larger files get a big buffer
+    buffering = _LARGE_READ_BUFFER if path.stat().st_size >= _SMALL_FILE_BYTES else -1
+    with open(path, "rb", buffering=buffering) as f:
+        return _load_yaml(f)
+
+
+def _list_yaml_files(directory: Path) -> list[Path]:
+    """List the .yaml and .yml files in a directory, sorted by name."""
+    with os.scandir(directory) as it:
+        names = [
+            entry.name
+            for entry in it
+            if entry.name.endswith(_YAML_SUFFIXES) and entry.is_file()
+        ]
+    names.sort()
+    return [directory / name for name in names]
+
+
+def _load_yaml_header(path: Path, keys: tuple[str, ...]) -> dict:
+    """Parse only the leading part of a YAML file that holds ``keys``.
+
+    Lines are read until every key has been seen as a top-level mapping key
+    and the next top-level line begins, so block values are complete. Falls
+    back to a full parse if the prefix doesn't parse as a mapping.
+    """
+    pending = set(keys)
+    lines = []
+    with open(path) as f:
+        for line in f:
+            if not pending and line[:1] not in _NON_KEY_STARTS:
+                break
+            lines.append(line)
+            match = _TOP_LEVEL_KEY_RE.match(line)
+            if match:
+                pending.discard(match.group(1))
+
+    try:
+        data = _load_yaml("".join(lines))
+    except Exception:
+        data = None
+    if data is None and not lines:
+        return {}
+    if not isinstance(data, dict):
+        data = _load_yaml_file(path) or {}
+    return data
+
+
+def _read_yaml_name(path: Path) -> str:
+    """Read the top-level ``name`` of an environment file.
+
+    Only the ``name:`` line is parsed. Files without a single-line name
+    are loaded in full so the default name still applies.
+    """
+    with open(path) as f:
+        for line in f:
+            if _NAME_LINE_RE.match(line):
+                try:
+                    value = _load_yaml(line)["name"]
+                except Exception:
+                    break
+                if isinstance(value, str) and value:
+                    return value
+                break
+
+    from .emulation import NetworkEnvironment
+
+    return NetworkEnvironment.from_yaml(str(path)).name
+
+
+def _read_sweep_summary(path: Path) -> tuple[str, int]:
+    """Get a sweep result's timestamp and number of results.
+
+    Returns:
+        Tuple of (timestamp or "Unknown", number of entries in ``results``)
+    """
+    from .analysis import load_sweep_result
+
+    data = load_sweep_result(path)
+    return data.get("timestamp", "Unknown"), len(data.get("results", []))
+
 
 def load_profile(profile_path: str) -> dict:
     """Load a test profile from a YAML file."""
+    import yaml
+
     path = Path(profile_path)
     if not path.exists():
         console.print(f"[red]Error: Profile not found: {profile_path}[/red]")
         sys.exit(1)
     
     try:
-        with open(path) as f:
-            result = yaml.safe_load(f)
+        result = _load_yaml_file(path)
     except yaml.YAMLError as e:
         console.print(f"[red]Error: Malformed YAML in {profile_path}: {e}[/red]")
         sys.exit(1)
@@ -51,7 +247,7 @@ def load_profile(profile_path: str) -> dict:
         console.print(f"[red]Error: Cannot read {profile_path}: {e}[/red]")
         sys.exit(1)
     
-    # Handle empty files (yaml.safe_load returns None)
+    # Handle empty files (the loader returns None)
     if result is None:
         return {}
     return result
@@ -59,6 +255,9 @@ def load_profile(profile_path: str) -> dict:
 
 def cmd_run(args: argparse.Namespace) -> None:
     """Run a network test using a profile."""
+    from .orchestrator import TestOrchestrator
+    from .results import ResultsCollector
+
     console.print(f"[bold blue]Loading profile: {args.profile}[/bold blue]")
     profile = load_profile(args.profile)
     
@@ -85,7 +284,7 @@ def cmd_run(args: argparse.Namespace) -> None:
     )
     
     try:
-        asyncio.run(orchestrator.run())
+        _run_async(orchestrator.run())
     except KeyboardInterrupt:
         console.print("\n[yellow]Test interrupted by user[/yellow]")
     
@@ -97,6 +296,8 @@ def cmd_run(args: argparse.Namespace) -> None:
 
 def cmd_server(args: argparse.Namespace) -> None:
     """Start iperf3 server pool."""
+    from .server import ServerPool
+
     console.print("[bold blue]Starting server pool...[/bold blue]")
     console.print(f"[green]Ports: {args.base_port} - {args.base_port + args.ports - 1}[/green]")
     
@@ -106,18 +307,26 @@ def cmd_server(args: argparse.Namespace) -> None:
     )
     
     try:
-        asyncio.run(pool.run())
+        _run_async(pool.run())
     except KeyboardInterrupt:
         console.print("\n[yellow]Server pool stopped[/yellow]")
 
 
 def cmd_env_apply(args: argparse.Namespace) -> None:
     """Apply a network environment."""
-    if emulator.clear():
-        console.print("[green]Network emulation cleared.[/green]")
-    else:
-        console.print("[red]Failed to clear network emulation.[/red]")
-        sys.exit(1)
+    from .emulation import (
+        NetworkEmulator,
+        NetworkEnvironment,
+        get_default_interface,
+        get_preset,
+        list_interfaces,
+        list_presets,
+    )
+
+    interface = args.interface or get_default_interface()
+    
+    if not interface:
+        console.print("[red]Error: Could not detect network interface.[/red]")
         console.print("[yellow]Please specify with --interface[/yellow]")
         console.print("\n[bold]Available interfaces:[/bold]")
         for iface in list_interfaces():
@@ -150,12 +359,9 @@ def cmd_env_apply(args: argparse.Namespace) -> None:
     # Set interface
     env.interface = interface
     
-    if emulator.apply(env):
-        console.print("\n[bold green]Environment applied successfully![/bold green]")
-        console.print("\n[yellow]Remember to run 'nettest env clear' when done.[/yellow]")
-    else:
-        console.print("[red]Failed to apply network environment.[/red]")
-        sys.exit(1)
+    emulator = NetworkEmulator(interface, verbose=args.verbose)
+    
+    console.print(f"[bold]Applying environment: {env.name}[/bold]")
     console.print(f"  Description: {env.description}")
     console.print(f"  Interface: [green]{interface}[/green]")
     
@@ -166,11 +372,14 @@ def cmd_env_apply(args: argparse.Namespace) -> None:
         console.print("\n[bold green]Environment applied successfully![/bold green]")
         console.print("\n[yellow]Remember to run 'nettest env clear' when done.[/yellow]")
     else:
+        console.print("[red]Failed to apply network environment.[/red]")
         sys.exit(1)
 
 
 def cmd_env_clear(args: argparse.Namespace) -> None:
     """Clear network emulation."""
+    from .emulation import NetworkEmulator, get_default_interface
+
     interface = args.interface or get_default_interface()
     
     if not interface:
@@ -187,31 +396,27 @@ def cmd_env_clear(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+@_buffered_output
 def cmd_env_list(args: argparse.Namespace) -> None:
     """List available environments."""
+    from .emulation import get_default_interface, list_interfaces, list_presets
+
     # List presets
     console.print("[bold cyan]Built-in Presets:[/bold cyan]")
-    table = Table(show_header=True)
-    table.add_column("Name", style="cyan")
-    table.add_column("Description")
-    
-    for name, desc in list_presets():
-        table.add_row(name, desc)
-    
-    console.print(table)
+    console.print(_rows_table(_PRESET_COLUMNS, list_presets()))
     
     # List environment files
     env_dir = Path("environments")
     if env_dir.exists():
         console.print("\n[bold cyan]Environment Files (environments/):[/bold cyan]")
-        yaml_files = list(env_dir.glob("*.yaml")) + list(env_dir.glob("*.yml"))
+        yaml_files = _list_yaml_files(env_dir)
         if yaml_files:
-            for f in sorted(yaml_files):
+            for f in yaml_files:
                 try:
-                    env = NetworkEnvironment.from_yaml(str(f))
-                    console.print(f"  [green]{f.name}[/green]: {env.name}")
+                    name = _read_yaml_name(f)
+                    console.print(Text.assemble("  ", (f.name, "green"), ": ", str(name)))
                 except Exception:
-                    console.print(f"  [yellow]{f.name}[/yellow]: (could not load)")
+                    console.print(Text.assemble("  ", (f.name, "yellow"), ": (could not load)"))
         else:
             console.print("  [dim]No environment files found[/dim]")
     
@@ -220,13 +425,16 @@ def cmd_env_list(args: argparse.Namespace) -> None:
     default = get_default_interface()
     for iface in list_interfaces():
         if iface == default:
-            console.print(f"  [green]{iface}[/green] (default)")
+            console.print(Text.assemble("  ", (iface, "green"), " (default)"))
         else:
-            console.print(f"  {iface}")
+            console.print(Text.assemble("  ", iface))
 
 
+@_buffered_output
 def cmd_env_status(args: argparse.Namespace) -> None:
     """Show current emulation status."""
+    from .emulation import NetworkEmulator, get_default_interface
+
     interface = args.interface or get_default_interface()
     
     if not interface:
@@ -234,7 +442,7 @@ def cmd_env_status(args: argparse.Namespace) -> None:
         sys.exit(1)
     
     emulator = NetworkEmulator(interface)
-    status = emulator.show_status()
+    status = _run_async(emulator.show_status_async())
     
     console.print(f"\n[bold]Traffic Control Status for {interface}:[/bold]")
     
@@ -259,7 +467,8 @@ def cmd_env_status(args: argparse.Namespace) -> None:
                 console.print(f"  {line}")
 
 
-def _print_env_config(env: NetworkEnvironment) -> None:
+@_buffered_output
+def _print_env_config(env: "NetworkEnvironment") -> None:
     """Print environment configuration summary."""
     console.print("\n[bold]Configuration:[/bold]")
     
@@ -288,6 +497,8 @@ def _print_env_config(env: NetworkEnvironment) -> None:
 
 def cmd_scenario_run(args: argparse.Namespace) -> None:
     """Run a single scenario."""
+    from .scenarios import ScenarioConfig, ScenarioRunner
+
     console.print(f"[bold blue]Loading scenario: {args.scenario}[/bold blue]")
     
     try:
@@ -314,7 +525,7 @@ def cmd_scenario_run(args: argparse.Namespace) -> None:
     )
     
     try:
-        result = asyncio.run(runner.run_scenario(config, apply_environment=not args.no_env))
+        result = _run_async(runner.run_scenario(config, apply_environment=not args.no_env))
         console.print(f"\n[green]Scenario completed: {result.success_rate:.1f}% success rate[/green]")
     except KeyboardInterrupt:
         console.print("\n[yellow]Scenario interrupted by user[/yellow]")
@@ -325,30 +536,47 @@ def cmd_scenario_run(args: argparse.Namespace) -> None:
 
 def cmd_scenario_sweep(args: argparse.Namespace) -> None:
     """Run a parameter sweep (multiple scenarios with varying parameters)."""
-    console.print(f"[bold blue]Loading sweep configuration: {args.scenario}[/bold blue]")
-    
-    try:
-        # Load sweep configuration from YAML
-        path = Path(args.scenario)
-        if not path.exists():
-            console.print(f"[red]Error: Scenario file not found: {args.scenario}[/red]")
-            sys.exit(1)
+    from .scenarios import ScenarioConfig, ScenarioRunner
+
+    if args.scenario:
+        console.print(f"[bold blue]Loading sweep configuration: {args.scenario}[/bold blue]")
         
-        with open(path) as f:
-            sweep_data = yaml.safe_load(f) or {}
-    except Exception as e:
-        console.print(f"[red]Error loading scenario: {e}[/red]")
+        try:
+            # Load sweep configuration from YAML
+            path = Path(args.scenario)
+            if not path.exists():
+                console.print(f"[red]Error: Scenario file not found: {args.scenario}[/red]")
+                sys.exit(1)
+            
+            sweep_data = _load_yaml_file(path) or {}
+        except Exception as e:
+            console.print(f"[red]Error loading scenario: {e}[/red]")
+            sys.exit(1)
+    elif args.clients:
+        # Inline sweep: everything comes from the command line
+        console.print("[bold blue]Using inline sweep configuration[/bold blue]")
+        sweep_data = {}
+    else:
+        console.print("[red]Error: Specify --scenario or --clients[/red]")
         sys.exit(1)
     
     # Extract sweep parameters
     client_counts = sweep_data.get("client_counts", [10, 20, 30])
     if args.clients:
         # Override with command-line specified counts
-        client_counts = [int(x.strip()) for x in args.clients.split(",")]
+        if not _CLIENT_COUNTS_ARG_RE.fullmatch(args.clients):
+            console.print(f"[red]Error: Invalid client counts in --clients '{args.clients}'[/red]")
+            sys.exit(1)
+        client_counts = [int(m) for m in _CLIENT_COUNT_RE.findall(args.clients)]
     
     # Build base config
-    base_config = ScenarioConfig.from_dict(sweep_data)
+    if sweep_data:
+        base_config = ScenarioConfig.from_dict(sweep_data)
+    else:
+        base_config = ScenarioConfig()
     
+    if args.name:
+        base_config.name = args.name
     if args.duration:
         base_config.duration = args.duration
     
@@ -372,7 +600,7 @@ def cmd_scenario_sweep(args: argparse.Namespace) -> None:
         console.print(f"  Environment preset: {base_config.environment_preset}")
     
     try:
-        sweep_result = asyncio.run(
+        sweep_result = _run_async(
             runner.run_client_sweep(
                 base_config=base_config,
                 client_counts=client_counts,
@@ -388,6 +616,74 @@ def cmd_scenario_sweep(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def _result_file_names(results_dir: Path) -> tuple[list[str], list[str]]:
+    """Split the JSON file names in a results directory in one scandir pass.
+
+    Returns:
+        Tuple of (sweep result names, single test result names), unsorted
+    """
+    sweeps = []
+    tests = []
+    try:
+        with os.scandir(results_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith(".json"):
+                    (sweeps if name.startswith("sweep_") else tests).append(name)
+    except OSError:
+        pass
+    return sweeps, tests
+
+
+def _rows_table(columns: tuple[tuple[str, Optional[str]], ...], rows) -> Table:
+    """Build a table from (header, style) column specs and gathered rows."""
+    table = Table(show_header=True)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+
+def _map_files(func, files: list[Path]) -> list:
+    """Apply ``func`` to each file on a small thread pool, keeping order.
+
+    Lets the file reads of a listing overlap instead of running one after
+    another.
+    """
+    if len(files) <= 1:
+        return [func(f) for f in files]
+    with ThreadPoolExecutor(max_workers=min(_LIST_WORKERS, len(files))) as pool:
+        return list(pool.map(func, files))
+
+
+def _scenario_row(f: Path) -> tuple[str, str, str]:
+    """Build the `scenario list` table row for one scenario file."""
+    try:
+        data = _load_yaml_header(f, ("name", "client_counts"))
+        name = data.get("name", "Unnamed")
+        if name is not None and not isinstance(name, str):
+            # The table can't render it; treat like any other bad file
+            raise TypeError(f"scenario name is not a string: {name!r}")
+        counts = data.get("client_counts", [])
+        counts_str = ", ".join(str(c) for c in counts[:5])
+        if len(counts) > 5:
+            counts_str += f" ... ({len(counts)} total)"
+        return f.name, name, counts_str
+    except Exception:
+        return f.name, "(could not load)", "-"
+
+
+def _sweep_row(f: Path) -> tuple[str, str, str]:
+    """Build the `results list` table row for one sweep result file."""
+    try:
+        timestamp, num_results = _read_sweep_summary(f)
+        return f.name, timestamp[:19], str(num_results)
+    except Exception:
+        return f.name, "?", "?"
+
+
+@_buffered_output
 def cmd_scenario_list(args: argparse.Namespace) -> None:
     """List available scenarios."""
     scenarios_dir = Path("scenarios")
@@ -395,27 +691,10 @@ def cmd_scenario_list(args: argparse.Namespace) -> None:
     console.print("[bold cyan]Available Scenarios:[/bold cyan]")
     
     if scenarios_dir.exists():
-        yaml_files = list(scenarios_dir.glob("*.yaml")) + list(scenarios_dir.glob("*.yml"))
+        yaml_files = _list_yaml_files(scenarios_dir)
         if yaml_files:
-            table = Table(show_header=True)
-            table.add_column("File", style="cyan")
-            table.add_column("Name")
-            table.add_column("Client Counts")
-            
-            for f in sorted(yaml_files):
-                try:
-                    with open(f) as fh:
-                        data = yaml.safe_load(fh) or {}
-                    name = data.get("name", "Unnamed")
-                    counts = data.get("client_counts", [])
-                    counts_str = ", ".join(str(c) for c in counts[:5])
-                    if len(counts) > 5:
-                        counts_str += f" ... ({len(counts)} total)"
-                    table.add_row(f.name, name, counts_str)
-                except Exception:
-                    table.add_row(f.name, "(could not load)", "-")
-            
-            console.print(table)
+            rows = _map_files(_scenario_row, yaml_files)
+            console.print(_rows_table(_SCENARIO_COLUMNS, rows))
         else:
             console.print("  [dim]No scenario files found in scenarios/[/dim]")
     else:
@@ -425,50 +704,37 @@ def cmd_scenario_list(args: argparse.Namespace) -> None:
     console.print("  python3 -m nettest scenario sweep -s scenarios/quick_client_test.yaml --server <IP>")
 
 
+@_buffered_output
 def cmd_results_list(args: argparse.Namespace) -> None:
     """List available result files."""
     results_dir = Path(args.dir)
+    sweep_names, test_names = _result_file_names(results_dir)
     
-    # List sweep results
-    sweeps = list_sweep_results(results_dir)
-    if sweeps:
+    # List sweep results (names embed the timestamp, so the largest are newest)
+    if sweep_names:
+        sweeps = [results_dir / name for name in heapq.nlargest(10, sweep_names)]
+        rows = _map_files(_sweep_row, sweeps)  # Show last 10
         console.print("[bold cyan]Sweep Results:[/bold cyan]")
-        table = Table(show_header=True)
-        table.add_column("File", style="cyan")
-        table.add_column("Timestamp")
-        table.add_column("Scenarios")
-        
-        for f in sweeps[:10]:  # Show last 10
-            try:
-                with open(f) as fh:
-                    data = yaml.safe_load(fh) or {}
-                timestamp = data.get("timestamp", "Unknown")[:19]
-                num_results = len(data.get("results", []))
-                table.add_row(f.name, timestamp, str(num_results))
-            except Exception:
-                table.add_row(f.name, "?", "?")
-        
-        console.print(table)
-        if len(sweeps) > 10:
-            console.print(f"  [dim]... and {len(sweeps) - 10} more[/dim]")
+        console.print(_rows_table(_SWEEP_COLUMNS, rows))
+        if len(sweep_names) > 10:
+            console.print(f"  [dim]... and {len(sweep_names) - 10} more[/dim]")
     
     # List test results
-    all_results = list_results(results_dir)
-    test_results = [r for r in all_results if not r.name.startswith("sweep_")]
-    
-    if test_results:
+    if test_names:
         console.print("\n[bold cyan]Test Results:[/bold cyan]")
-        for f in test_results[:10]:
-            console.print(f"  {f.name}")
-        if len(test_results) > 10:
-            console.print(f"  [dim]... and {len(test_results) - 10} more[/dim]")
+        for name in heapq.nlargest(10, test_names):
+            console.print(Text.assemble("  ", name))
+        if len(test_names) > 10:
+            console.print(f"  [dim]... and {len(test_names) - 10} more[/dim]")
     
-    if not sweeps and not test_results:
+    if not sweep_names and not test_names:
         console.print("[yellow]No result files found[/yellow]")
 
 
 def cmd_results_analyze(args: argparse.Namespace) -> None:
     """Analyze a sweep result file."""
+    from .analysis import analyze_sweep, print_analysis
+
     filepath = Path(args.file)
     if not filepath.exists():
         console.print(f"[red]File not found: {filepath}[/red]")
@@ -484,10 +750,19 @@ def cmd_results_analyze(args: argparse.Namespace) -> None:
 
 def cmd_results_compare(args: argparse.Namespace) -> None:
     """Compare multiple sweep results."""
-    filepaths = [Path(f) for f in args.files]
-    
-    # Check files exist
-    missing = [f for f in filepaths if not f.exists()]
+    from .analysis import compare_sweeps
+
+    # Check files exist, in a single stat pass
+    filepaths = []
+    missing = []
+    for name in args.files:
+        path = Path(name)
+        try:
+            os.stat(path)
+        except OSError:
+            missing.append(path)
+        else:
+            filepaths.append(path)
     if missing:
         console.print(f"[red]Files not found: {missing}[/red]")
         sys.exit(1)
@@ -497,6 +772,8 @@ def cmd_results_compare(args: argparse.Namespace) -> None:
 
 def cmd_results_export(args: argparse.Namespace) -> None:
     """Export sweep results to CSV."""
+    from .analysis import export_sweep_csv
+
     filepath = Path(args.file)
     if not filepath.exists():
         console.print(f"[red]File not found: {filepath}[/red]")
@@ -511,8 +788,13 @@ def cmd_results_export(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
-def main() -> None:
-    """Main entry point."""
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser.
+
+    The parser tree is fixed, so it is built once and reused by every
+    call to main().
+    """
     parser = argparse.ArgumentParser(
         prog="nettest",
         description="Network Testing Suite - Traffic Generation and Environment Emulation",
@@ -687,8 +969,7 @@ def main() -> None:
     )
     scenario_sweep_parser.add_argument(
         "--scenario", "-s",
-        required=True,
-        help="Path to scenario YAML file",
+        help="Path to scenario YAML file (optional when --clients is given)",
     )
     scenario_sweep_parser.add_argument(
         "--server",
@@ -699,6 +980,10 @@ def main() -> None:
         "--clients", "-c",
         help="Override client counts (comma-separated, e.g., '10,20,30')",
     )
+    scenario_sweep_parser.add_argument(
+        "--name",
+        help="Sweep name (defaults to the scenario's name)",
+    )
     scenario_sweep_parser.add_argument(
         "--duration", "-d",
         type=int,
@@ -786,7 +1071,12 @@ def main() -> None:
     )
     results_export_parser.set_defaults(func=cmd_results_export)
     
-    args = parser.parse_args()
+    return parser
+
+
+def main() -> None:
+    """Main entry point."""
+    args = _build_parser().parse_args()
     args.func(args)
 
 
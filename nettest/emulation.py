@@ -14,26 +14,58 @@ Inspired by tools like comcast, toxiproxy, and wondershaper.
 """
 
 import asyncio
+import copy
 import os
 import platform
+import re
 import subprocess
 import shutil
-import tempfile
-from dataclasses import dataclass, field
-from typing import Optional
+import time
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Optional
 from pathlib import Path
 
-import yaml
-from rich.console import Console
+# yaml and rich are imported on first use: callers that only need presets
+# or interface lookups shouldn't pay for loading them
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Created on first use; emulation is imported by commands that never print
+_console: Optional["Console"] = None
+
+
+def _get_console() -> "Console":
+    """Return the module console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def __getattr__(name: str):
+    """Expose the lazily created ``console`` as a module attribute."""
+    if name == "console":
+        return _get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def _safe_loader() -> type:
+    """Return the libyaml-backed safe loader when PyYAML was built with it."""
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-console = Console()
 
 # Detect platform
 IS_MACOS = platform.system() == "Darwin"
 IS_LINUX = platform.system() == "Linux"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LatencyConfig:
     """Latency/delay configuration."""
 
@@ -43,7 +75,7 @@ class LatencyConfig:
     distribution: str = "normal"  # normal, pareto, paretonormal
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PacketLossConfig:
     """Packet loss configuration."""
 
@@ -56,7 +88,7 @@ class PacketLossConfig:
     p14: float = 0  # Probability of ECN marking
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PacketCorruptionConfig:
     """Packet corruption configuration."""
 
@@ -64,7 +96,7 @@ class PacketCorruptionConfig:
     correlation_pct: float = 0  # Correlation with previous packet
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PacketDuplicationConfig:
     """Packet duplication configuration."""
 
@@ -72,7 +104,7 @@ class PacketDuplicationConfig:
     correlation_pct: float = 0  # Correlation with previous packet
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PacketReorderingConfig:
     """Packet reordering configuration."""
 
@@ -81,7 +113,7 @@ class PacketReorderingConfig:
     gap: int = 5  # Gap before reordering
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BandwidthConfig:
     """Bandwidth limiting configuration using HTB (Hierarchical Token Bucket)."""
 
@@ -93,7 +125,7 @@ class BandwidthConfig:
     limit: int = 0  # Queue size limit in bytes
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SlotConfig:
     """Slot-based packet scheduling (for bursty traffic)."""
 
@@ -103,7 +135,35 @@ class SlotConfig:
     bytes_count: int = 0  # Number of bytes per slot
 
 
-@dataclass
+# Environment YAML section -> config dataclass. Each section name is also
+# the NetworkEnvironment attribute it populates.
+_SECTIONS = (
+    ("latency", LatencyConfig),
+    ("packet_loss", PacketLossConfig),
+    ("corruption", PacketCorruptionConfig),
+    ("duplication", PacketDuplicationConfig),
+    ("reordering", PacketReorderingConfig),
+    ("bandwidth", BandwidthConfig),
+    ("slot", SlotConfig),
+)
+
+# Dataclass fields whose YAML key differs from the field name
+_YAML_KEY_RENAMES = {"bytes_count": "bytes"}
+
+# section -> (config class, ((field name, YAML key, default), ...)), built once
+_FIELD_SPEC = {
+    section: (
+        config_cls,
+        tuple(
+            (f.name, _YAML_KEY_RENAMES.get(f.name, f.name), f.default)
+            for f in fields(config_cls)
+        ),
+    )
+    for section, config_cls in _SECTIONS
+}
+
+
+@dataclass(slots=True)
 class NetworkEnvironment:
     """Complete network environment configuration."""
 
@@ -112,13 +172,15 @@ class NetworkEnvironment:
     interface: str = ""  # Network interface to apply to (e.g., eth0)
     direction: str = "egress"  # egress, ingress, or both
 
-    latency: LatencyConfig = field(default_factory=LatencyConfig)
-    packet_loss: PacketLossConfig = field(default_factory=PacketLossConfig)
-    corruption: PacketCorruptionConfig = field(default_factory=PacketCorruptionConfig)
-    duplication: PacketDuplicationConfig = field(default_factory=PacketDuplicationConfig)
-    reordering: PacketReorderingConfig = field(default_factory=PacketReorderingConfig)
-    bandwidth: BandwidthConfig = field(default_factory=BandwidthConfig)
-    slot: SlotConfig = field(default_factory=SlotConfig)
+    # Sub-configs are frozen, so every environment can share one default
+    # instance of each instead of allocating fresh ones
+    latency: LatencyConfig = LatencyConfig()
+    packet_loss: PacketLossConfig = PacketLossConfig()
+    corruption: PacketCorruptionConfig = PacketCorruptionConfig()
+    duplication: PacketDuplicationConfig = PacketDuplicationConfig()
+    reordering: PacketReorderingConfig = PacketReorderingConfig()
+    bandwidth: BandwidthConfig = BandwidthConfig()
+    slot: SlotConfig = SlotConfig()
 
     # Rate limiting for specific targets
     target_ips: list[str] = field(default_factory=list)
@@ -128,14 +190,49 @@ class NetworkEnvironment:
     @classmethod
     def from_yaml(cls, yaml_path: str) -> "NetworkEnvironment":
         """Load environment configuration from YAML file."""
+        import yaml
+
+        # Binary mode lets libyaml decode the UTF-8 itself
+        try:
+            with open(yaml_path, "rb") as f:
+                data = yaml.load(f, Loader=_safe_loader()) or {}
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Environment file not found: {yaml_path}") from None
+
+        return cls.from_dict(data)
+
+    @classmethod
+    def from_yaml_header(
+        cls, yaml_path: str, expected_name: Optional[str] = None
+    ) -> Optional["NetworkEnvironment"]:
+        """Load an environment file only if its top-level name matches.
+
+        The file is walked as YAML parse events until the top-level ``name``
+        is known, so files describing other environments are rejected
+        without building the document. Matching files are loaded in full
+        via from_yaml.
+
+        Args:
+            yaml_path: Path to the environment YAML file
+            expected_name: Name to match; None accepts any environment
+
+        Returns:
+            The environment, or None if its name differs from expected_name
+        """
+        if expected_name is None:
+            return cls.from_yaml(yaml_path)
+
         path = Path(yaml_path)
         if not path.exists():
             raise FileNotFoundError(f"Environment file not found: {yaml_path}")
 
-        with open(path, encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        name = _read_top_level_name(path)
+        if name is not None:
+            return cls.from_yaml(yaml_path) if name == expected_name else None
 
-        return cls.from_dict(data)
+        # Name couldn't be read from the event stream; let a full parse decide
+        env = cls.from_yaml(yaml_path)
+        return env if env.name == expected_name else None
 
     @classmethod
     def from_dict(cls, data: dict) -> "NetworkEnvironment":
@@ -146,120 +243,198 @@ class NetworkEnvironment:
         env.interface = data.get("interface", "")
         env.direction = data.get("direction", "egress")
 
-        # Parse latency config
-        latency_data = data.get("latency", {})
-        if latency_data:
-            env.latency = LatencyConfig(
-                delay_ms=latency_data.get("delay_ms", 0),
-                jitter_ms=latency_data.get("jitter_ms", 0),
-                correlation_pct=latency_data.get("correlation_pct", 0),
-                distribution=latency_data.get("distribution", "normal"),
-            )
+        # Parse the per-feature sections (latency, loss, bandwidth, ...)
+        for section, (config_cls, spec) in _FIELD_SPEC.items():
+            section_data = data.get(section)
+            if section_data:
+                setattr(env, section, config_cls(
+                    **{name: section_data.get(key, default) for name, key, default in spec}
+                ))
 
-        # Parse packet loss config
-        loss_data = data.get("packet_loss", {})
-        if loss_data:
-            env.packet_loss = PacketLossConfig(
-                loss_pct=loss_data.get("loss_pct", 0),
-                correlation_pct=loss_data.get("correlation_pct", 0),
-                p13=loss_data.get("p13", 0),
-                p31=loss_data.get("p31", 100),
-                p32=loss_data.get("p32", 0),
-                p14=loss_data.get("p14", 0),
-            )
+        # Target filtering
+        env.target_ips = data.get("target_ips", [])
+        env.target_ports = data.get("target_ports", [])
+        env.protocols = data.get("protocols", [])
 
-        # Parse corruption config
-        corrupt_data = data.get("corruption", {})
-        if corrupt_data:
-            env.corruption = PacketCorruptionConfig(
-                corrupt_pct=corrupt_data.get("corrupt_pct", 0),
-                correlation_pct=corrupt_data.get("correlation_pct", 0),
-            )
+        return env
 
-        # Parse duplication config
-        dup_data = data.get("duplication", {})
-        if dup_data:
-            env.duplication = PacketDuplicationConfig(
-                duplicate_pct=dup_data.get("duplicate_pct", 0),
-                correlation_pct=dup_data.get("correlation_pct", 0),
-            )
 
-        # Parse reordering config
-        reorder_data = data.get("reordering", {})
-        if reorder_data:
-            env.reordering = PacketReorderingConfig(
-                reorder_pct=reorder_data.get("reorder_pct", 0),
-                correlation_pct=reorder_data.get("correlation_pct", 0),
-                gap=reorder_data.get("gap", 5),
-            )
+# Tag a plain scalar must resolve to for its text to be taken as a str
+_STR_TAG = "tag:yaml.org,2002:str"
 
-        # Parse bandwidth config
-        bw_data = data.get("bandwidth", {})
-        if bw_data:
-            env.bandwidth = BandwidthConfig(
-                rate=bw_data.get("rate", ""),
-                burst=bw_data.get("burst", ""),
-                latency_ms=bw_data.get("latency_ms", 50),
-                buffer=bw_data.get("buffer", 0),
-                limit=bw_data.get("limit", 0),
-            )
+# Where tc (Linux) and dnctl/pfctl (macOS) are normally installed
+_SBIN_DIRS = ("/sbin", "/usr/sbin", "/usr/local/sbin")
 
-        # Parse slot config (for burst simulation)
-        slot_data = data.get("slot", {})
-        if slot_data:
-            env.slot = SlotConfig(
-                min_delay_ms=slot_data.get("min_delay_ms", 0),
-                max_delay_ms=slot_data.get("max_delay_ms", 0),
-                packets=slot_data.get("packets", 0),
-                bytes_count=slot_data.get("bytes", 0),
-            )
+# tc rate suffix -> dummynet bandwidth unit
+_DUMMYNET_RATE_SUFFIXES = {"mbit": "Mbit/s", "kbit": "Kbit/s", "gbit": "Gbit/s"}
 
-        # Target filtering
-        env.target_ips = data.get("target_ips", [])
-        env.target_ports = data.get("target_ports", [])
-        env.protocols = data.get("protocols", [])
+# "dev <name>" token pair in `ip route show default` output
+_DEFAULT_DEV_RE = re.compile(r"(?:^|\s)dev\s+(\S+)")
 
-        return env
+# Interface name in each `ip -o link show` line: "1: lo: <LOOPBACK,...>",
+# "5: veth0@if4: <...>"
+_IP_LINK_RE = re.compile(r"^\d+:\s+([^:@\s]+)", re.MULTILINE)
+
+# "interface: <name>" line in macOS `route -n get default` output
+_ROUTE_INTERFACE_RE = re.compile(r"interface:[ \t]*([^\s:]*)")
+
+# Kernel views of the routing table and network devices (Linux)
+_PROC_NET_ROUTE = "/proc/net/route"
+_SYS_CLASS_NET = "/sys/class/net"
+_RTF_UP = 0x0001  # Route usable flag in /proc/net/route
+
+# HTB class burst used when an environment doesn't set one
+_DEFAULT_HTB_BURST = "32kbit"
+
+# netem value templates, formatted the same way as str() of the value
+_NETEM_FMTS = {
+    "ms": "{}ms",
+    "pct": "{}%",
+}
+
+# Loopback and tunnel interfaces hidden from the macOS interface list
+_MACOS_INTERNAL_IF_PREFIXES = ("lo", "gif", "stf", "utun")
 
+# Seconds an interface lookup is reused before the system is probed again
+_INTERFACE_CACHE_TTL = 5.0
 
+# Interface lookups keyed by probe function: (monotonic timestamp, result)
+_INTERFACE_CACHE: dict[Callable[[], Any], tuple[float, Any]] = {}
+
+# Leading stderr of "tc qdisc del ... root" when no root qdisc exists
+# (older iproute2 reports ENOENT, newer versions the handle-zero error)
+_MISSING_QDISC_ERRORS = (
+    b"RTNETLINK answers: No such file",
+    b"Error: Cannot delete qdisc with handle of zero",
+)
+
+def _read_top_level_name(path: Path) -> Optional[str]:
+    """Read an environment's top-level ``name`` from the YAML event stream.
+
+    Stops as soon as the name's value arrives. Returns "default" when the
+    top-level mapping ends without a name, matching from_dict. Returns None
+    when the name can't be decided without a full parse (non-mapping
+    documents, aliases, non-string or non-scalar values).
+    """
+    import yaml
+
+    depth = 0
+    is_key = True  # Next node at depth 1 is a mapping key
+    at_name = False
+    with open(path, "rb") as f:
+        for event in yaml.parse(f, Loader=_safe_loader()):
+            if isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+                if depth == 0:
+                    return "default"
+                continue
+            if not isinstance(event, yaml.NodeEvent):
+                continue
+
+            starts_collection = isinstance(event, yaml.CollectionStartEvent)
+            if depth == 0:
+                if not isinstance(event, yaml.MappingStartEvent):
+                    return None
+                depth = 1
+                continue
+
+            if depth == 1:
+                if is_key:
+                    at_name = isinstance(event, yaml.ScalarEvent) and event.value == "name"
+                elif at_name:
+                    if not isinstance(event, yaml.ScalarEvent):
+                        return None
+                    tag = yaml.resolver.Resolver().resolve(
+                        yaml.ScalarNode, event.value, event.implicit
+                    )
+                    return event.value if tag == _STR_TAG else None
+                is_key = not is_key
+
+            if starts_collection:
+                depth += 1
+    return None
+
+
+@lru_cache(maxsize=None)
+def _find_executable(name: str) -> Optional[str]:
+    """Locate a system tool, trying its usual sbin locations before PATH.
+
+    tc, dnctl and pfctl live in an sbin directory on every supported
+    system, so probing those directly usually takes one access() call
+    instead of a walk over every PATH entry.
+
+    Returns:
+        Full path to the executable, or None if it can't be found
+    """
+    for directory in _SBIN_DIRS:
+        candidate = os.path.join(directory, name)
+        if os.access(candidate, os.X_OK):
+            return candidate
+    return shutil.which(name)
+
+
+@lru_cache(maxsize=1)
 def _check_tc_available() -> bool:
     """Check if tc command is available (Linux)."""
-    return shutil.which("tc") is not None
+    return _find_executable("tc") is not None
 
 
+@lru_cache(maxsize=1)
 def _check_dnctl_available() -> bool:
     """Check if dnctl command is available (macOS)."""
-    return shutil.which("dnctl") is not None
+    return _find_executable("dnctl") is not None
 
 
+@lru_cache(maxsize=1)
 def _check_pfctl_available() -> bool:
     """Check if pfctl command is available (macOS)."""
-    return shutil.which("pfctl") is not None
+    return _find_executable("pfctl") is not None
 
 
+@lru_cache(maxsize=1)
 def _check_root() -> bool:
-    """Check if running as root/sudo."""
-    import os
-    return os.geteuid() == 0
+    """Check if running as root/sudo.
+
+    Checked once per process; call ``_check_root.cache_clear()`` after
+    changing privileges. Platforms without geteuid() (Windows) are never
+    treated as root.
+    """
+    return hasattr(os, "geteuid") and os.geteuid() == 0
 
 
 def _run_command(
-    cmd: list[str], check: bool = True, sudo: bool = False
+    cmd: list[str],
+    check: bool = True,
+    sudo: bool = False,
+    input: str | bytes | None = None,
+    text: bool = False,
 ) -> subprocess.CompletedProcess:
-    """Run a shell command."""
+    """Run a shell command, optionally feeding ``input`` to its stdin.
+
+    Input and output are bytes unless ``text=True``; most callers never look
+    at the output, so it isn't decoded up front.
+
+    The executable is passed as a full path and close_fds is off, which lets
+    CPython start the child with posix_spawn() instead of fork()+exec().
+    Python-created descriptors are non-inheritable, so nothing extra leaks.
+    """
     if sudo and not _check_root():
         cmd = ["sudo"] + cmd
     try:
         result = subprocess.run(
             cmd,
+            executable=_find_executable(cmd[0]),
+            input=input,
             capture_output=True,
-            text=True,
+            text=text,
             check=check,
+            close_fds=False,
         )
         return result
     except subprocess.CalledProcessError as e:
-        console.print(f"[red]Command failed: {' '.join(cmd)}[/red]")
-        console.print(f"[red]Error: {e.stderr}[/red]")
+        stderr = e.stderr if text else e.stderr.decode(errors="replace")
+        _get_console().print(f"[red]Command failed: {' '.join(cmd)}[/red]")
+        _get_console().print(f"[red]Error: {stderr}[/red]")
         raise
 
 
@@ -268,19 +443,49 @@ def _run_tc_command(args: list[str], check: bool = True) -> subprocess.Completed
     return _run_command(["tc"] + args, check=check)
 
 
+def _run_tc_batch(commands: list[list[str]], check: bool = True) -> subprocess.CompletedProcess:
+    """Run several tc commands through a single ``tc -batch -`` process (Linux).
+
+    Each command is written to tc's stdin as one line, so the whole set costs
+    one fork/exec instead of one per command. tc stops at the first failing
+    line.
+    """
+    script = "".join(" ".join(args) + "\n" for args in commands).encode("utf-8")
+    return _run_command(["tc", "-batch", "-"], check=check, input=script)
+
+
 def _run_dnctl_command(args: list[str], check: bool = True) -> subprocess.CompletedProcess:
     """Run a dnctl command (macOS)."""
     return _run_command(["dnctl"] + args, check=check, sudo=True)
 
 
-def _run_pfctl_command(args: list[str], check: bool = True) -> subprocess.CompletedProcess:
+def _run_pfctl_command(
+    args: list[str], check: bool = True, input: Optional[bytes] = None
+) -> subprocess.CompletedProcess:
     """Run a pfctl command (macOS)."""
-    return _run_command(["pfctl"] + args, check=check, sudo=True)
+    return _run_command(["pfctl"] + args, check=check, sudo=True, input=input)
 
 
-async def _run_tc_command_async(args: list[str], check: bool = True) -> tuple[int, str, str]:
-    """Run a tc command asynchronously."""
-    cmd = ["tc"] + args
+@lru_cache(maxsize=1)
+def _enable_pf() -> None:
+    """Enable pf once per process (macOS).
+
+    ``pfctl -e`` fails harmlessly when pf is already enabled, so the result
+    is not checked.
+    """
+    _run_pfctl_command(["-e"], check=False)
+
+
+async def _run_command_async(
+    cmd: list[str], check: bool = True, sudo: bool = False
+) -> tuple[int, str, str]:
+    """Run a shell command asynchronously.
+
+    Returns:
+        Tuple of (returncode, stdout, stderr)
+    """
+    if sudo and not _check_root():
+        cmd = ["sudo"] + cmd
     proc = await asyncio.create_subprocess_exec(
         *cmd,
         stdout=asyncio.subprocess.PIPE,
@@ -291,8 +496,8 @@ async def _run_tc_command_async(args: list[str], check: bool = True) -> tuple[in
     stderr_str = stderr_bytes.decode()
 
     if check and proc.returncode != 0:
-        console.print(f"[red]tc command failed: {' '.join(cmd)}[/red]")
-        console.print(f"[red]Error: {stderr_str}[/red]")
+        _get_console().print(f"[red]Command failed: {' '.join(cmd)}[/red]")
+        _get_console().print(f"[red]Error: {stderr_str}[/red]")
         raise subprocess.CalledProcessError(
             proc.returncode or 1, cmd, output=stdout_str, stderr=stderr_str
         )
@@ -300,6 +505,112 @@ async def _run_tc_command_async(args: list[str], check: bool = True) -> tuple[in
     return proc.returncode or 0, stdout_str, stderr_str
 
 
+async def _run_tc_command_async(args: list[str], check: bool = True) -> tuple[int, str, str]:
+    """Run a tc command asynchronously."""
+    return await _run_command_async(["tc"] + args, check=check)
+
+
+async def _run_dnctl_command_async(args: list[str], check: bool = True) -> tuple[int, str, str]:
+    """Run a dnctl command asynchronously (macOS)."""
+    return await _run_command_async(["dnctl"] + args, check=check, sudo=True)
+
+
+async def _run_pfctl_command_async(args: list[str], check: bool = True) -> tuple[int, str, str]:
+    """Run a pfctl command asynchronously (macOS)."""
+    return await _run_command_async(["pfctl"] + args, check=check, sudo=True)
+
+
+def _is_missing_qdisc(stderr: bytes) -> bool:
+    """Check whether tc's stderr reports that there was no qdisc to delete."""
+    return stderr.startswith(_MISSING_QDISC_ERRORS)
+
+
+def _output_lines(stdout: str) -> list[str]:
+    """Split command output into lines, returning [] for empty output."""
+    return stdout.strip().split("\n") if stdout else []
+
+
+@lru_cache(maxsize=128)
+def _netem_argv(
+    latency: LatencyConfig,
+    loss: PacketLossConfig,
+    corruption: PacketCorruptionConfig,
+    duplication: PacketDuplicationConfig,
+    reordering: PacketReorderingConfig,
+    slot: SlotConfig,
+) -> tuple[str, ...]:
+    """Build netem arguments, one token per element.
+
+    The configs are frozen and hashable, so the argv for a given set of
+    settings (every preset, for instance) is only formatted once.
+    """
+    ms = _NETEM_FMTS["ms"].format
+    pct = _NETEM_FMTS["pct"].format
+    args: list[str] = []
+    append = args.append
+
+    # Latency
+    if latency.delay_ms > 0:
+        append("delay")
+        append(ms(latency.delay_ms))
+        if latency.jitter_ms > 0:
+            append(ms(latency.jitter_ms))
+            if latency.correlation_pct > 0:
+                append(pct(latency.correlation_pct))
+            if latency.distribution != "normal":
+                append("distribution")
+                append(latency.distribution)
+
+    # Packet loss
+    if loss.loss_pct > 0:
+        append("loss")
+        append(pct(loss.loss_pct))
+        if loss.correlation_pct > 0:
+            append(pct(loss.correlation_pct))
+    elif loss.p13 > 0:
+        # Gilbert-Elliott model for burst loss
+        args += ("loss", "state", pct(loss.p13), pct(loss.p31), pct(loss.p32), pct(loss.p14))
+
+    # Corruption
+    if corruption.corrupt_pct > 0:
+        append("corrupt")
+        append(pct(corruption.corrupt_pct))
+        if corruption.correlation_pct > 0:
+            append(pct(corruption.correlation_pct))
+
+    # Duplication
+    if duplication.duplicate_pct > 0:
+        append("duplicate")
+        append(pct(duplication.duplicate_pct))
+        if duplication.correlation_pct > 0:
+            append(pct(duplication.correlation_pct))
+
+    # Reordering
+    if reordering.reorder_pct > 0:
+        append("reorder")
+        append(pct(reordering.reorder_pct))
+        if reordering.correlation_pct > 0:
+            append(pct(reordering.correlation_pct))
+        if reordering.gap > 0:
+            append("gap")
+            append(str(reordering.gap))
+
+    # Slot-based scheduling (for burst simulation)
+    if slot.min_delay_ms > 0:
+        append("slot")
+        append(ms(slot.min_delay_ms))
+        if slot.max_delay_ms > 0:
+            append(ms(slot.max_delay_ms))
+        if slot.packets > 0:
+            append("packets")
+            append(str(slot.packets))
+        if slot.bytes_count > 0:
+            append("bytes")
+            append(str(slot.bytes_count))
+
+    return tuple(args)
+
+
 class NetworkEmulator:
     """Network environment emulator using tc/netem."""
 
@@ -314,11 +625,13 @@ class NetworkEmulator:
         self.verbose = verbose
         self._active = False
         self._ifb_device = "ifb0"  # For ingress traffic shaping
+        # (interface, snapshot of env) from the last successful apply
+        self._applied: Optional[tuple[str, NetworkEnvironment]] = None
 
     def _log(self, message: str) -> None:
         """Log message if verbose."""
         if self.verbose:
-            console.print(f"[dim]{message}[/dim]")
+            _get_console().print(f"[dim]{message}[/dim]")
 
     def check_requirements(self) -> list[str]:
         """Check system requirements and return list of issues."""
@@ -333,63 +646,11 @@ class NetworkEmulator:
         return issues
 
     def _build_netem_args(self, env: NetworkEnvironment) -> list[str]:
-        """Build netem arguments from environment config."""
-        args = []
-
-        # Latency
-        if env.latency.delay_ms > 0:
-            args.append(f"delay {env.latency.delay_ms}ms")
-            if env.latency.jitter_ms > 0:
-                args.append(f"{env.latency.jitter_ms}ms")
-                if env.latency.correlation_pct > 0:
-                    args.append(f"{env.latency.correlation_pct}%")
-                if env.latency.distribution != "normal":
-                    args.append(f"distribution {env.latency.distribution}")
-
-        # Packet loss
-        if env.packet_loss.loss_pct > 0:
-            args.append(f"loss {env.packet_loss.loss_pct}%")
-            if env.packet_loss.correlation_pct > 0:
-                args.append(f"{env.packet_loss.correlation_pct}%")
-        elif env.packet_loss.p13 > 0:
-            # Gilbert-Elliott model for burst loss
-            args.append(
-                f"loss state {env.packet_loss.p13}% {env.packet_loss.p31}% "
-                f"{env.packet_loss.p32}% {env.packet_loss.p14}%"
-            )
-
-        # Corruption
-        if env.corruption.corrupt_pct > 0:
-            args.append(f"corrupt {env.corruption.corrupt_pct}%")
-            if env.corruption.correlation_pct > 0:
-                args.append(f"{env.corruption.correlation_pct}%")
-
-        # Duplication
-        if env.duplication.duplicate_pct > 0:
-            args.append(f"duplicate {env.duplication.duplicate_pct}%")
-            if env.duplication.correlation_pct > 0:
-                args.append(f"{env.duplication.correlation_pct}%")
-
-        # Reordering
-        if env.reordering.reorder_pct > 0:
-            args.append(f"reorder {env.reordering.reorder_pct}%")
-            if env.reordering.correlation_pct > 0:
-                args.append(f"{env.reordering.correlation_pct}%")
-            if env.reordering.gap > 0:
-                args.append(f"gap {env.reordering.gap}")
-
-        # Slot-based scheduling (for burst simulation)
-        if env.slot.min_delay_ms > 0:
-            slot_args = f"slot {env.slot.min_delay_ms}ms"
-            if env.slot.max_delay_ms > 0:
-                slot_args += f" {env.slot.max_delay_ms}ms"
-            if env.slot.packets > 0:
-                slot_args += f" packets {env.slot.packets}"
-            if env.slot.bytes_count > 0:
-                slot_args += f" bytes {env.slot.bytes_count}"
-            args.append(slot_args)
-
-        return args
+        """Build netem arguments from environment config, one token per element."""
+        return list(_netem_argv(
+            env.latency, env.packet_loss, env.corruption,
+            env.duplication, env.reordering, env.slot,
+        ))
 
     def apply(self, env: NetworkEnvironment) -> bool:
         """Apply network environment emulation.
@@ -403,11 +664,16 @@ class NetworkEmulator:
         issues = self.check_requirements()
         if issues:
             for issue in issues:
-                console.print(f"[red]Error: {issue}[/red]")
+                _get_console().print(f"[red]Error: {issue}[/red]")
             return False
 
         interface = env.interface or self.interface
 
+        # Re-applying the environment that is already in place is a no-op
+        if self._active and self._applied == (interface, env):
+            self._log(f"Network environment '{env.name}' already applied to {interface}")
+            return True
+
         try:
             # Clear existing rules first (on the same interface we're about to configure)
             self.clear(interface=interface)
@@ -415,60 +681,67 @@ class NetworkEmulator:
             # Build netem parameters
             netem_args = self._build_netem_args(env)
 
+            # Collect the tc commands and run them in one batch
+            commands: list[list[str]] = []
+
             # Apply bandwidth limiting with TBF if specified
             if env.bandwidth.rate:
-                self._apply_bandwidth_limit(interface, env.bandwidth)
+                self._apply_bandwidth_limit(commands, interface, env.bandwidth)
 
             # Apply netem rules if we have any
             if netem_args:
-                self._apply_netem(interface, netem_args, env.bandwidth.rate != "")
+                self._apply_netem(commands, interface, netem_args, env.bandwidth.rate != "")
+
+            if commands:
+                _run_tc_batch(commands)
 
             self._active = True
-            console.print(f"[green]Network environment '{env.name}' applied to {interface}[/green]")
+            self._applied = (interface, copy.deepcopy(env))
+            _get_console().print(f"[green]Network environment '{env.name}' applied to {interface}[/green]")
             return True
 
         except Exception as e:
-            console.print(f"[red]Failed to apply network environment: {e}[/red]")
+            _get_console().print(f"[red]Failed to apply network environment: {e}[/red]")
             return False
 
-    def _apply_netem(self, interface: str, netem_args: list[str], has_tbf: bool = False) -> None:
-        """Apply netem rules."""
-        netem_str = " ".join(netem_args)
-
+    def _apply_netem(
+        self,
+        commands: list[list[str]],
+        interface: str,
+        netem_args: list[str],
+        has_tbf: bool = False,
+    ) -> None:
+        """Queue the netem qdisc command onto ``commands``."""
         if has_tbf:
             # Add netem as a child of the tbf qdisc
             cmd_args = ["qdisc", "add", "dev", interface, "parent", "1:1",
-                        "handle", "10:", "netem"] + netem_str.split()
+                        "handle", "10:", "netem", *netem_args]
         else:
             # Add netem as root qdisc
             cmd_args = ["qdisc", "add", "dev", interface, "root",
-                        "handle", "1:", "netem"] + netem_str.split()
+                        "handle", "1:", "netem", *netem_args]
 
         self._log(f"Applying netem: tc {' '.join(cmd_args)}")
-        _run_tc_command(cmd_args)
+        commands.append(cmd_args)
 
-    def _apply_bandwidth_limit(self, interface: str, bw: BandwidthConfig) -> None:
-        """Apply bandwidth limiting using TBF (Token Bucket Filter)."""
-        # Calculate burst size if not specified
-        burst = bw.burst
-        if not burst:
-            # Default burst to rate / 8 (1 second of data at specified rate)
-            # This is a simplified calculation
-            burst = "32kbit"
+    def _apply_bandwidth_limit(
+        self, commands: list[list[str]], interface: str, bw: BandwidthConfig
+    ) -> None:
+        """Queue bandwidth limiting commands (HTB root and class) onto ``commands``."""
+        # Fall back to a fixed burst size if not specified
+        burst = bw.burst or _DEFAULT_HTB_BURST
 
         # Use HTB (Hierarchical Token Bucket) for more precise control
         cmd_args = ["qdisc", "add", "dev", interface, "root",
                     "handle", "1:", "htb", "default", "1"]
         self._log(f"Adding HTB root: tc {' '.join(cmd_args)}")
-        _run_tc_command(cmd_args)
+        commands.append(cmd_args)
 
         # Add class with rate limit
         cmd_args = ["class", "add", "dev", interface, "parent", "1:",
-                    "classid", "1:1", "htb", "rate", bw.rate]
-        if burst:
-            cmd_args.extend(["burst", burst])
+                    "classid", "1:1", "htb", "rate", bw.rate, "burst", burst]
         self._log(f"Adding HTB class: tc {' '.join(cmd_args)}")
-        _run_tc_command(cmd_args)
+        commands.append(cmd_args)
 
     def clear(self, interface: Optional[str] = None) -> bool:
         """Clear all emulation rules.
@@ -487,14 +760,15 @@ class NetworkEmulator:
                 ["qdisc", "del", "dev", target_interface, "root"],
                 check=False
             )
-            # ENOENT (no qdisc) is okay
-            if result.returncode != 0 and "RTNETLINK answers: No such file" not in result.stderr:
-                self._log(f"Note: {result.stderr.strip()}")
+            # A missing root qdisc is okay; anything else is only worth a note
+            if result.returncode != 0 and self.verbose and not _is_missing_qdisc(result.stderr):
+                self._log(f"Note: {result.stderr.decode(errors='replace').strip()}")
 
             self._active = False
+            self._applied = None
             return True
         except Exception as e:
-            console.print(f"[red]Failed to clear rules: {e}[/red]")
+            _get_console().print(f"[red]Failed to clear rules: {e}[/red]")
             return False
 
     def show_status(self) -> dict:
@@ -511,32 +785,42 @@ class NetworkEmulator:
         }
 
         try:
-            # Get qdiscs
-            result = _run_tc_command(
-                ["qdisc", "show", "dev", self.interface],
-                check=False
-            )
-            if result.stdout:
-                status["qdiscs"] = result.stdout.strip().split("\n")
+            for kind, key in (("qdisc", "qdiscs"), ("class", "classes"), ("filter", "filters")):
+                result = _run_command(["tc", kind, "show", "dev", self.interface], check=False, text=True)
+                status[key] = _output_lines(result.stdout)
 
-            # Get classes
-            result = _run_tc_command(
-                ["class", "show", "dev", self.interface],
-                check=False
-            )
-            if result.stdout:
-                status["classes"] = result.stdout.strip().split("\n")
+        except Exception as e:
+            _get_console().print(f"[yellow]Could not get status: {e}[/yellow]")
 
-            # Get filters
-            result = _run_tc_command(
-                ["filter", "show", "dev", self.interface],
-                check=False
+        return status
+
+    async def show_status_async(self) -> dict:
+        """Query qdiscs, classes and filters concurrently.
+
+        Same result as show_status(); use this one from async code.
+
+        Returns:
+            Dictionary with qdisc, class, and filter information
+        """
+        status = {
+            "interface": self.interface,
+            "qdiscs": [],
+            "classes": [],
+            "filters": [],
+        }
+
+        try:
+            qdiscs, classes, filters = await asyncio.gather(
+                _run_tc_command_async(["qdisc", "show", "dev", self.interface], check=False),
+                _run_tc_command_async(["class", "show", "dev", self.interface], check=False),
+                _run_tc_command_async(["filter", "show", "dev", self.interface], check=False),
             )
-            if result.stdout:
-                status["filters"] = result.stdout.strip().split("\n")
+            status["qdiscs"] = _output_lines(qdiscs[1])
+            status["classes"] = _output_lines(classes[1])
+            status["filters"] = _output_lines(filters[1])
 
         except Exception as e:
-            console.print(f"[yellow]Could not get status: {e}[/yellow]")
+            _get_console().print(f"[yellow]Could not get status: {e}[/yellow]")
 
         return status
 
@@ -564,14 +848,11 @@ class MacOSNetworkEmulator:
         self._active = False
         self._pipe_num = MacOSNetworkEmulator._PIPE_NUM
         self._anchor_name = "nettest"
-        # Use a secure temporary file instead of hardcoded path
-        self._pf_conf_fd: int | None = None
-        self._pf_conf_path: Path | None = None
 
     def _log(self, message: str) -> None:
         """Log message if verbose."""
         if self.verbose:
-            console.print(f"[dim]{message}[/dim]")
+            _get_console().print(f"[dim]{message}[/dim]")
 
     def check_requirements(self) -> list[str]:
         """Check system requirements and return list of issues."""
@@ -600,7 +881,7 @@ class MacOSNetworkEmulator:
         issues = self.check_requirements()
         if issues:
             for issue in issues:
-                console.print(f"[red]Error: {issue}[/red]")
+                _get_console().print(f"[red]Error: {issue}[/red]")
             return False
 
         try:
@@ -611,67 +892,59 @@ class MacOSNetworkEmulator:
             pipe_config = self._build_pipe_config(env)
 
             if not pipe_config:
-                console.print("[yellow]No emulation parameters specified[/yellow]")
+                _get_console().print("[yellow]No emulation parameters specified[/yellow]")
                 return False
 
             # Create the dummynet pipe
-            self._log(f"Creating pipe: dnctl pipe {self._pipe_num} config {pipe_config}")
-            _run_dnctl_command(
-                ["pipe", str(self._pipe_num), "config"] + pipe_config.split()
-            )
+            self._log(f"Creating pipe: dnctl pipe {self._pipe_num} config {' '.join(pipe_config)}")
+            _run_dnctl_command(["pipe", str(self._pipe_num), "config", *pipe_config])
 
-            # Create pf anchor rules to direct traffic through the pipe
-            self._create_pf_rules(env)
-
-            # Load the pf rules
-            self._load_pf_rules()
+            # Load pf anchor rules to direct traffic through the pipe
+            self._load_pf_rules(self._build_pf_rules(env))
 
             self._active = True
-            console.print(f"[green]Network environment '{env.name}' applied[/green]")
-            console.print(
+            _get_console().print(f"[green]Network environment '{env.name}' applied[/green]")
+            _get_console().print(
                 f"[yellow]Note: macOS dummynet applies to all traffic, not just {self.interface}[/yellow]"
             )
             return True
 
         except Exception as e:
-            console.print(f"[red]Failed to apply network environment: {e}[/red]")
+            _get_console().print(f"[red]Failed to apply network environment: {e}[/red]")
             return False
 
-    def _build_pipe_config(self, env: NetworkEnvironment) -> str:
-        """Build dummynet pipe configuration string."""
-        config_parts = []
+    def _build_pipe_config(self, env: NetworkEnvironment) -> list[str]:
+        """Build dummynet pipe configuration arguments, one token per element."""
+        config_parts: list[str] = []
 
         # Bandwidth limiting
         if env.bandwidth.rate:
             # Convert rate format (e.g., "10mbit" -> "10Mbit/s")
             rate = env.bandwidth.rate.lower()
-            if rate.endswith("mbit"):
-                bw = rate.replace("mbit", "Mbit/s")
-            elif rate.endswith("kbit"):
-                bw = rate.replace("kbit", "Kbit/s")
-            elif rate.endswith("gbit"):
-                bw = rate.replace("gbit", "Gbit/s")
-            else:
-                bw = rate
-            config_parts.append(f"bw {bw}")
+            bw = rate
+            for suffix, dummynet_suffix in _DUMMYNET_RATE_SUFFIXES.items():
+                if rate.endswith(suffix):
+                    bw = rate[:-len(suffix)] + dummynet_suffix
+                    break
+            config_parts += ("bw", bw)
 
         # Latency (delay) - preserve fractional milliseconds for sub-ms delays
         if env.latency.delay_ms > 0:
-            config_parts.append(f"delay {env.latency.delay_ms:.3f}ms")
+            config_parts += ("delay", f"{env.latency.delay_ms:.3f}ms")
 
         # Packet loss (dummynet uses "plr" = packet loss rate, 0-1)
         if env.packet_loss.loss_pct > 0:
             plr = env.packet_loss.loss_pct / 100.0
-            config_parts.append(f"plr {plr}")
+            config_parts += ("plr", str(plr))
 
         # Queue size (optional)
         if env.bandwidth.limit > 0:
-            config_parts.append(f"queue {env.bandwidth.limit}")
+            config_parts += ("queue", str(env.bandwidth.limit))
 
-        return " ".join(config_parts)
+        return config_parts
 
-    def _create_pf_rules(self, env: NetworkEnvironment) -> None:
-        """Create pf configuration file for traffic redirection."""
+    def _build_pf_rules(self, env: NetworkEnvironment) -> bytes:
+        """Build the pf anchor configuration for traffic redirection."""
         # Create pf rules that redirect traffic through our dummynet pipe
         rules = []
 
@@ -688,56 +961,29 @@ class MacOSNetworkEmulator:
             # Apply to all traffic (both directions for symmetric effect)
             rules.append(f"dummynet in all pipe {self._pipe_num}")
 
-        # Write pf configuration
-        pf_content = f"""# Network Testing Suite - Temporary PF rules
-# Generated by nettest
-
-anchor "{self._anchor_name}" {{
-{chr(10).join('    ' + r for r in rules)}
-}}
-"""
-        # Clean up any existing temp file first
-        self._cleanup_pf_conf()
-
-        # Create a secure temporary file with restricted permissions (mode 0600)
-        self._pf_conf_fd, pf_conf_path_str = tempfile.mkstemp(
-            prefix="nettest_pf_", suffix=".conf"
+        # Build pf configuration as bytes in one buffer
+        pf_content = bytearray(
+            b"# Network Testing Suite - Temporary PF rules\n"
+            b"# Generated by nettest\n"
+            b"\n"
+            b'anchor "'
         )
-        self._pf_conf_path = Path(pf_conf_path_str)
-
-        # Write content and close the file descriptor
-        os.write(self._pf_conf_fd, pf_content.encode("utf-8"))
-        os.close(self._pf_conf_fd)
-        self._pf_conf_fd = None
-
-        self._log(f"PF config written to {self._pf_conf_path}")
-
-    def _cleanup_pf_conf(self) -> None:
-        """Clean up the secure temporary PF config file."""
-        if self._pf_conf_fd is not None:
-            try:
-                os.close(self._pf_conf_fd)
-            except OSError:
-                pass  # Already closed
-            self._pf_conf_fd = None
-
-        if self._pf_conf_path is not None and self._pf_conf_path.exists():
-            try:
-                self._pf_conf_path.unlink()
-            except OSError:
-                pass  # Best effort cleanup
-            self._pf_conf_path = None
-
-    def _load_pf_rules(self) -> None:
-        """Load pf rules into the system."""
-        if self._pf_conf_path is None:
-            raise RuntimeError("PF config file not created")
-
-        # First, enable pf if not already enabled
-        _run_pfctl_command(["-e"], check=False)  # May fail if already enabled
+        pf_content += self._anchor_name.encode("utf-8")
+        pf_content += b'" {\n'
+        for rule in rules:
+            pf_content += b"    "
+            pf_content += rule.encode("utf-8")
+            pf_content += b"\n"
+        pf_content += b"}\n"
+        return bytes(pf_content)
+
+    def _load_pf_rules(self, pf_content: bytes) -> None:
+        """Load pf rules into the system, passing them to pfctl on stdin."""
+        # Enable pf if not already enabled (done once per process)
+        _enable_pf()
 
         # Load our anchor rules
-        _run_pfctl_command(["-a", self._anchor_name, "-f", str(self._pf_conf_path)])
+        _run_pfctl_command(["-a", self._anchor_name, "-f", "-"], input=pf_content)
         self._log("PF rules loaded")
 
     def clear(self, interface: Optional[str] = None) -> bool:
@@ -756,14 +1002,11 @@ anchor "{self._anchor_name}" {{
             # Delete the dummynet pipe
             _run_dnctl_command(["pipe", str(self._pipe_num), "delete"], check=False)
 
-            # Clean up secure temp file
-            self._cleanup_pf_conf()
-
             self._active = False
             return True
 
         except Exception as e:
-            console.print(f"[red]Failed to clear rules: {e}[/red]")
+            _get_console().print(f"[red]Failed to clear rules: {e}[/red]")
             return False
 
     def show_status(self) -> dict:
@@ -779,20 +1022,43 @@ anchor "{self._anchor_name}" {{
         }
 
         try:
-            # Get pipe status
-            result = _run_dnctl_command(["pipe", "show"], check=False)
-            if result.stdout:
-                status["pipes"] = result.stdout.strip().split("\n")
-
-            # Get pf anchor rules
-            result = _run_pfctl_command(
-                ["-a", self._anchor_name, "-s", "rules"], check=False
+            result = _run_command(["dnctl", "pipe", "show"], check=False, sudo=True, text=True)
+            status["pipes"] = _output_lines(result.stdout)
+
+            result = _run_command(
+                ["pfctl", "-a", self._anchor_name, "-s", "rules"], check=False, sudo=True, text=True
             )
-            if result.stdout:
-                status["pf_rules"] = result.stdout.strip().split("\n")
+            status["pf_rules"] = _output_lines(result.stdout)
 
         except Exception as e:
-            console.print(f"[yellow]Could not get status: {e}[/yellow]")
+            _get_console().print(f"[yellow]Could not get status: {e}[/yellow]")
+
+        return status
+
+    async def show_status_async(self) -> dict:
+        """Query dummynet pipes and pf anchor rules concurrently.
+
+        Same result as show_status(); use this one from async code.
+
+        Returns:
+            Dictionary with pipe information
+        """
+        status = {
+            "interface": self.interface,
+            "pipes": [],
+            "pf_rules": [],
+        }
+
+        try:
+            pipes, pf_rules = await asyncio.gather(
+                _run_dnctl_command_async(["pipe", "show"], check=False),
+                _run_pfctl_command_async(["-a", self._anchor_name, "-s", "rules"], check=False),
+            )
+            status["pipes"] = _output_lines(pipes[1])
+            status["pf_rules"] = _output_lines(pf_rules[1])
+
+        except Exception as e:
+            _get_console().print(f"[yellow]Could not get status: {e}[/yellow]")
 
         return status
 
@@ -822,34 +1088,93 @@ def create_emulator(interface: str, verbose: bool = False) -> NetworkEmulator |
         )
 
 
+def _cached_interface_lookup(probe: Callable[[], Any]) -> Any:
+    """Return ``probe()``, reusing its result for _INTERFACE_CACHE_TTL seconds."""
+    now = time.monotonic()
+    entry = _INTERFACE_CACHE.get(probe)
+    if entry is not None and now - entry[0] < _INTERFACE_CACHE_TTL:
+        return entry[1]
+    value = probe()
+    _INTERFACE_CACHE[probe] = (now, value)
+    return value
+
+
+def invalidate_interface_cache() -> None:
+    """Forget cached interface lookups so the next call probes the system."""
+    _INTERFACE_CACHE.clear()
+
+
 def get_default_interface() -> Optional[str]:
     """Get the default network interface.
 
+    Results are cached for a few seconds; call invalidate_interface_cache()
+    to force a fresh probe.
+
     Returns:
         Interface name or None if not found
     """
     if IS_MACOS:
-        return _get_default_interface_macos()
+        return _cached_interface_lookup(_get_default_interface_macos)
     else:
-        return _get_default_interface_linux()
+        return _cached_interface_lookup(_get_default_interface_linux)
+
+
+def _probe_output(cmd: list[str]) -> Optional[str]:
+    """Run an interface probe and return its stdout, or None if it failed.
+
+    Probes never look at stderr, so it goes to /dev/null instead of being
+    captured, and stdout is decoded once here.
+    """
+    result = subprocess.run(
+        cmd,
+        executable=_find_executable(cmd[0]),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=False,
+        close_fds=False,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode(errors="replace")
 
 
 def _get_default_interface_linux() -> Optional[str]:
-    """Get default interface on Linux."""
+    """Get default interface on Linux.
+
+    Reads the kernel's IPv4 routing table from /proc/net/route and picks the
+    lowest-metric default route, falling back to ``ip route`` when procfs
+    isn't readable.
+    """
     try:
-        result = subprocess.run(
-            ["ip", "route", "show", "default"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0 and result.stdout:
+        best: Optional[tuple[int, str]] = None
+        with open(_PROC_NET_ROUTE, encoding="ascii") as f:
+            next(f)  # Header line
+            for line in f:
+                # Iface Destination Gateway Flags RefCnt Use Metric Mask ...
+                fields = line.split()
+                if (
+                    len(fields) >= 8
+                    and fields[1] == "00000000"
+                    and fields[7] == "00000000"
+                    and int(fields[3], 16) & _RTF_UP
+                ):
+                    metric = int(fields[6])
+                    if best is None or metric < best[0]:
+                        best = (metric, fields[0])
+        return best[1] if best else None
+    except (OSError, ValueError, StopIteration):
+        return _get_default_interface_ip()
+
+
+def _get_default_interface_ip() -> Optional[str]:
+    """Get default interface on Linux by running ``ip route``."""
+    try:
+        output = _probe_output(["ip", "route", "show", "default"])
+        if output:
             # Parse: default via X.X.X.X dev INTERFACE ...
-            parts = result.stdout.split()
-            if "dev" in parts:
-                idx = parts.index("dev")
-                if idx + 1 < len(parts):
-                    return parts[idx + 1]
+            match = _DEFAULT_DEV_RE.search(output)
+            if match:
+                return match.group(1)
     except Exception:
         pass
     return None
@@ -859,30 +1184,20 @@ def _get_default_interface_macos() -> Optional[str]:
     """Get default interface on macOS."""
     try:
         # Get default route
-        result = subprocess.run(
-            ["route", "-n", "get", "default"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0 and result.stdout:
-            for line in result.stdout.split("\n"):
-                if "interface:" in line:
-                    return line.split(":")[1].strip()
+        output = _probe_output(["route", "-n", "get", "default"])
+        if output:
+            match = _ROUTE_INTERFACE_RE.search(output)
+            if match:
+                return match.group(1)
     except Exception:
         pass
 
     # Fallback: try to find active interface
     try:
-        result = subprocess.run(
-            ["networksetup", "-listallhardwareports"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0:
+        output = _probe_output(["networksetup", "-listallhardwareports"])
+        if output is not None:
             # Look for Wi-Fi or Ethernet
-            lines = result.stdout.split("\n")
+            lines = output.split("\n")
             for i, line in enumerate(lines):
                 if "Wi-Fi" in line or "Ethernet" in line:
                     # Next line should have Device: enX
@@ -897,32 +1212,48 @@ def _get_default_interface_macos() -> Optional[str]:
 def list_interfaces() -> list[str]:
     """List available network interfaces.
 
+    Results are cached for a few seconds; call invalidate_interface_cache()
+    to force a fresh probe.
+
     Returns:
         List of interface names
     """
     if IS_MACOS:
-        return _list_interfaces_macos()
+        return list(_cached_interface_lookup(_list_interfaces_macos))
     else:
-        return _list_interfaces_linux()
+        return list(_cached_interface_lookup(_list_interfaces_linux))
 
 
 def _list_interfaces_linux() -> list[str]:
-    """List interfaces on Linux."""
+    """List interfaces on Linux.
+
+    Reads /sys/class/net and orders the names by ifindex, as ``ip link``
+    does, falling back to ``ip link`` when sysfs isn't readable.
+    """
+    try:
+        indexed = []
+        with os.scandir(_SYS_CLASS_NET) as it:
+            for entry in it:
+                try:
+                    with open(os.path.join(entry.path, "ifindex"), encoding="ascii") as f:
+                        indexed.append((int(f.read()), entry.name))
+                except OSError:
+                    continue  # Not a device (e.g. bonding_masters)
+        if indexed:
+            indexed.sort()
+            return [name for _, name in indexed]
+    except (OSError, ValueError):
+        pass
+    return _list_interfaces_ip()
+
+
+def _list_interfaces_ip() -> list[str]:
+    """List interfaces on Linux by running ``ip link``."""
     interfaces = []
     try:
-        result = subprocess.run(
-            ["ip", "-o", "link", "show"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
-                # Format: 1: lo: <LOOPBACK,UP,LOWER_UP> ...
-                parts = line.split(":")
-                if len(parts) >= 2:
-                    iface = parts[1].strip().split("@")[0]
-                    interfaces.append(iface)
+        output = _probe_output(["ip", "-o", "link", "show"])
+        if output is not None:
+            interfaces = _IP_LINK_RE.findall(output)
     except Exception:
         pass
     return interfaces
@@ -932,19 +1263,12 @@ def _list_interfaces_macos() -> list[str]:
     """List interfaces on macOS."""
     interfaces = []
     try:
-        result = subprocess.run(
-            ["ifconfig", "-l"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0:
-            interfaces = result.stdout.strip().split()
+        output = _probe_output(["ifconfig", "-l"])
+        if output is not None:
             # Filter out loopback and internal interfaces
             interfaces = [
-                i for i in interfaces
-                if not i.startswith("lo") and not i.startswith("gif")
-                and not i.startswith("stf") and not i.startswith("utun")
+                i for i in output.split()
+                if not i.startswith(_MACOS_INTERNAL_IF_PREFIXES)
             ]
     except Exception:
         pass
@@ -1001,17 +1325,25 @@ PRESET_ENVIRONMENTS = {
     ),
 }
 
+# (name, description) pairs for list_presets, built once
+_PRESET_LIST = tuple((name, env.description) for name, env in PRESET_ENVIRONMENTS.items())
+
 
+@lru_cache(maxsize=32)
 def get_preset(name: str) -> Optional[NetworkEnvironment]:
     """Get a preset network environment by name.
 
+    Lookups are memoized; call ``get_preset.cache_clear()`` after changing
+    PRESET_ENVIRONMENTS at runtime.
+
     Args:
         name: Preset name (e.g., "4g-mobile", "satellite")
 
     Returns:
         NetworkEnvironment or None if not found
     """
-    return PRESET_ENVIRONMENTS.get(name.lower())
+    # Preset keys are lowercase; skip the copy when the name already is
+    return PRESET_ENVIRONMENTS.get(name if name.islower() else name.lower())
 
 
 def list_presets() -> list[tuple[str, str]]:
@@ -1020,4 +1352,4 @@ def list_presets() -> list[tuple[str, str]]:
     Returns:
         List of (name, description) tuples
     """
-    return [(name, env.description) for name, env in PRESET_ENVIRONMENTS.items()]
+    return list(_PRESET_LIST)
@@ -1,18 +1,37 @@
 """Flow generators for mice and elephant traffic patterns."""
 
 import asyncio
+import itertools
 import json
 import random
+import re
+import shutil
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Callable
 
-from rich.console import Console
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-console = Console()
+# iperf3 -J reports are parsed straight from the subprocess bytes; orjson is
+# used when installed, and both decoders raise json.JSONDecodeError subclasses
+_json_loads = orjson.loads if orjson is not None else json.loads
 
+# Markers for the TCP fast path. iperf3 writes "sum_sent" once, in the end
+# section, as a flat object; "timesecs" sits near the top of the start block
+_SUM_SENT_KEY = b'"sum_sent"'
+_ERROR_KEY = b'"error"'
+_TIMESECS_RE = re.compile(rb'"timesecs"\s*:\s*(\d+)')
 
-@dataclass
+# Mouse sizes are sampled once into a pool of this many and then cycled, so
+# the dispatch path never calls the RNG; large enough to keep the uniform mix
+_SIZE_POOL_LEN = 1024
+
+
+@dataclass(slots=True, frozen=True)
 class FlowResult:
     """Result of a single flow."""
     flow_type: str
@@ -30,28 +49,46 @@ class FlowResult:
     error: str | None = None
 
 
-def parse_iperf3_output(output: str, flow_type: str, flow_id: int, port: int) -> FlowResult:
+def _failed_result(
+    flow_type: str,
+    flow_id: int,
+    port: int,
+    error: str,
+    start_time: float | None = None,
+) -> FlowResult:
+    """Build the FlowResult for a flow that produced no usable report."""
+    now = time.time()
+    return FlowResult(
+        flow_type=flow_type,
+        flow_id=flow_id,
+        port=port,
+        start_time=now if start_time is None else start_time,
+        end_time=now,
+        bytes_transferred=0,
+        bits_per_second=0,
+        retransmits=0,
+        jitter_ms=0,
+        lost_packets=0,
+        total_packets=0,
+        success=False,
+        error=error,
+    )
+
+
+def parse_iperf3_output(output: bytes | str, flow_type: str, flow_id: int, port: int) -> FlowResult:
     """Parse iperf3 JSON output into a FlowResult."""
+    # Plain TCP successes (every mice and elephant run) skip the full parse
+    if isinstance(output, bytes):
+        result = _decode_tcp_sum_sent(output, flow_type, flow_id, port)
+        if result is not None:
+            return result
+    
     try:
-        data = json.loads(output)
+        data = _json_loads(output)
         
         # Check for error
         if "error" in data:
-            return FlowResult(
-                flow_type=flow_type,
-                flow_id=flow_id,
-                port=port,
-                start_time=time.time(),
-                end_time=time.time(),
-                bytes_transferred=0,
-                bits_per_second=0,
-                retransmits=0,
-                jitter_ms=0,
-                lost_packets=0,
-                total_packets=0,
-                success=False,
-                error=data["error"],
-            )
+            return _failed_result(flow_type, flow_id, port, data["error"])
         
         end_data = data.get("end", {})
         
@@ -110,38 +147,120 @@ def parse_iperf3_output(output: str, flow_type: str, flow_id: int, port: int) ->
                 success=True,
             )
         
-        return FlowResult(
-            flow_type=flow_type,
-            flow_id=flow_id,
-            port=port,
-            start_time=time.time(),
-            end_time=time.time(),
-            bytes_transferred=0,
-            bits_per_second=0,
-            retransmits=0,
-            jitter_ms=0,
-            lost_packets=0,
-            total_packets=0,
-            success=False,
-            error="Could not parse iperf3 output",
-        )
+        return _failed_result(flow_type, flow_id, port, "Could not parse iperf3 output")
         
     except json.JSONDecodeError as e:
-        return FlowResult(
-            flow_type=flow_type,
-            flow_id=flow_id,
-            port=port,
-            start_time=time.time(),
-            end_time=time.time(),
-            bytes_transferred=0,
-            bits_per_second=0,
-            retransmits=0,
-            jitter_ms=0,
-            lost_packets=0,
-            total_packets=0,
-            success=False,
-            error=f"JSON parse error: {e}",
-        )
+        return _failed_result(flow_type, flow_id, port, f"JSON parse error: {e}")
+
+
+def parse_iperf3_streams(
+    output: bytes | str,
+    flow_type: str,
+    flow_ids: range,
+    port: int,
+) -> list[FlowResult]:
+    """Parse a multi-stream (-P) iperf3 report into one FlowResult per stream.
+    
+    Streams are paired with flow_ids in report order. If the run failed, or
+    the report does not list one stream per flow id, every flow gets the
+    same failed result.
+    """
+    try:
+        data = _json_loads(output)
+    except json.JSONDecodeError as e:
+        error = f"JSON parse error: {e}"
+    else:
+        streams = data.get("end", {}).get("streams", [])
+        if "error" in data:
+            error = data["error"]
+        elif len(streams) == len(flow_ids):
+            end_time = time.time()
+            start_time = data.get("start", {}).get("timestamp", {}).get("timesecs", end_time)
+            results = []
+            for flow_id, stream in zip(flow_ids, streams):
+                sender = stream.get("sender", stream.get("udp", {}))
+                results.append(FlowResult(
+                    flow_type=flow_type,
+                    flow_id=flow_id,
+                    port=port,
+                    start_time=start_time,
+                    end_time=end_time,
+                    bytes_transferred=sender.get("bytes", 0),
+                    bits_per_second=sender.get("bits_per_second", 0),
+                    retransmits=sender.get("retransmits", 0),
+                    jitter_ms=sender.get("jitter_ms", 0),
+                    lost_packets=sender.get("lost_packets", 0),
+                    total_packets=sender.get("packets", 0),
+                    success=True,
+                ))
+            return results
+        else:
+            error = "Could not parse iperf3 output"
+    return [_failed_result(flow_type, flow_id, port, error) for flow_id in flow_ids]
+
+
+def _decode_tcp_sum_sent(output: bytes, flow_type: str, flow_id: int, port: int) -> FlowResult | None:
+    """Decode a successful TCP iperf3 report without parsing the whole document.
+
+    Only the flat end.sum_sent object (and the start timestamp) is decoded,
+    so the per-interval samples never become Python objects.
+
+    Returns:
+        The FlowResult, or None when the report is not a plain TCP success
+        and needs the full parse.
+    """
+    key = output.rfind(_SUM_SENT_KEY)
+    if key < 0 or _ERROR_KEY in output:
+        return None
+    begin = output.find(b"{", key)
+    end = output.find(b"}", begin)
+    if begin < 0 or end < 0:
+        return None
+    try:
+        sent = _json_loads(output[begin:end + 1])
+    except json.JSONDecodeError:
+        return None
+    
+    match = _TIMESECS_RE.search(output)
+    now = time.time()
+    return FlowResult(
+        flow_type=flow_type,
+        flow_id=flow_id,
+        port=port,
+        start_time=int(match[1]) if match else now,
+        end_time=now,
+        bytes_transferred=sent.get("bytes", 0),
+        bits_per_second=sent.get("bits_per_second", 0),
+        retransmits=sent.get("retransmits", 0),
+        jitter_ms=0,
+        lost_packets=0,
+        total_packets=0,
+        success=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def iperf3_executable() -> str | None:
+    """Resolve iperf3 on PATH once per process."""
+    return shutil.which("iperf3")
+
+
+async def _spawn_iperf3(cmd: list[str]) -> asyncio.subprocess.Process:
+    """Start an iperf3 client with stdout and stderr piped.
+
+    Passing the resolved executable with close_fds off lets CPython launch
+    the client through posix_spawn() rather than fork()+exec(), which is
+    most of the per-flow spawn cost at high mice rates. The descriptors
+    Python opens are non-inheritable, so the child sees only its pipes.
+    If iperf3 is not on PATH the spawn fails with FileNotFoundError as before.
+    """
+    return await asyncio.create_subprocess_exec(
+        *cmd,
+        executable=iperf3_executable(),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        close_fds=False,
+    )
 
 
 class MiceFlowGenerator:
@@ -159,18 +278,26 @@ class MiceFlowGenerator:
         self.flow_counter = 0
         self._running = False
         self._tasks: set[asyncio.Task] = set()
+        
+        # Random sizes within range, drawn up front and cycled per flow
+        size_range = self.config.get("size_range", [1024, 102400])
+        if len(size_range) < 2:
+            size_range = [1024, 102400]
+        low, high = size_range[0], size_range[1]
+        self._sizes = itertools.cycle([random.randint(low, high) for _ in range(_SIZE_POOL_LEN)])
+    
+    def describe(self) -> str:
+        """Describe the flows run() will generate, for the test banner."""
+        concurrent = self.config.get("concurrent", 50)
+        rate = self.config.get("rate", 100)
+        return f"Starting mice flows: {concurrent} concurrent, {rate}/s rate"
     
     async def generate_flow(self) -> FlowResult:
         """Generate a single mice flow."""
         self.flow_counter += 1
         flow_id = self.flow_counter
         port = self.port_allocator()
-        
-        # Random size within range
-        size_range = self.config.get("size_range", [1024, 102400])
-        if len(size_range) < 2:
-            size_range = [1024, 102400]
-        size = random.randint(size_range[0], size_range[1])
+        size = next(self._sizes)
         
         # Build iperf3 command
         cmd = [
@@ -181,32 +308,17 @@ class MiceFlowGenerator:
             "-J",  # JSON output
         ]
         
+        start_time = time.time()
+        
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+            proc = await _spawn_iperf3(cmd)
             stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=30)
             
             if stdout:
-                return parse_iperf3_output(stdout.decode(), "mice", flow_id, port)
+                return parse_iperf3_output(stdout, "mice", flow_id, port)
             else:
-                return FlowResult(
-                    flow_type="mice",
-                    flow_id=flow_id,
-                    port=port,
-                    start_time=time.time(),
-                    end_time=time.time(),
-                    bytes_transferred=0,
-                    bits_per_second=0,
-                    retransmits=0,
-                    jitter_ms=0,
-                    lost_packets=0,
-                    total_packets=0,
-                    success=False,
-                    error=stderr.decode() if stderr else "No output",
-                )
+                error = stderr.decode() if stderr else "No output"
+                return _failed_result("mice", flow_id, port, error, start_time=start_time)
         except asyncio.TimeoutError:
             # Kill orphaned process to prevent zombies
             try:
@@ -214,37 +326,9 @@ class MiceFlowGenerator:
                 await proc.wait()
             except (ProcessLookupError, OSError):
                 pass  # Process already exited
-            return FlowResult(
-                flow_type="mice",
-                flow_id=flow_id,
-                port=port,
-                start_time=time.time(),
-                end_time=time.time(),
-                bytes_transferred=0,
-                bits_per_second=0,
-                retransmits=0,
-                jitter_ms=0,
-                lost_packets=0,
-                total_packets=0,
-                success=False,
-                error="Timeout",
-            )
+            return _failed_result("mice", flow_id, port, "Timeout", start_time=start_time)
         except Exception as e:
-            return FlowResult(
-                flow_type="mice",
-                flow_id=flow_id,
-                port=port,
-                start_time=time.time(),
-                end_time=time.time(),
-                bytes_transferred=0,
-                bits_per_second=0,
-                retransmits=0,
-                jitter_ms=0,
-                lost_packets=0,
-                total_packets=0,
-                success=False,
-                error=str(e),
-            )
+            return _failed_result("mice", flow_id, port, str(e), start_time=start_time)
     
     async def run(
         self,
@@ -258,7 +342,10 @@ class MiceFlowGenerator:
         interval = 1.0 / rate if rate > 0 else 0.01
         
         semaphore = asyncio.Semaphore(concurrent)
-        end_time = time.time() + duration
+        # The loop's monotonic clock bounds the run, so wall-clock steps
+        # (NTP, suspend) cannot stretch or cut short the dispatch window
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
         
         async def run_flow():
             async with semaphore:
@@ -267,13 +354,16 @@ class MiceFlowGenerator:
                 result = await self.generate_flow()
                 result_callback(result)
         
-        console.print(f"[cyan]Starting mice flows: {concurrent} concurrent, {rate}/s rate[/cyan]")
-        
-        while self._running and time.time() < end_time:
+        # Dispatch on a fixed schedule: each slot is interval after the previous
+        # one, not after the previous wake-up, so sleep overshoot and task
+        # creation time do not accumulate into a lower effective rate
+        next_at = loop.time()
+        while self._running and loop.time() < deadline:
             task = asyncio.create_task(run_flow())
             self._tasks.add(task)
             task.add_done_callback(self._tasks.discard)
-            await asyncio.sleep(interval)
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
         
         # Wait for remaining tasks (snapshot to avoid race with done callbacks)
         snapshot = list(self._tasks)
@@ -300,14 +390,17 @@ class ElephantFlowGenerator:
         self.flow_counter = 0
         self._running = False
         self._tasks: set[asyncio.Task] = set()
-        self._processes: list[asyncio.subprocess.Process] = []
+        self._processes: set[asyncio.subprocess.Process] = set()
     
-    async def generate_flow(self, duration: float) -> FlowResult:
-        """Generate a single elephant flow."""
-        self.flow_counter += 1
-        flow_id = self.flow_counter
-        port = self.port_allocator()
-        
+    def describe(self) -> str:
+        """Describe the flows run() will generate, for the test banner."""
+        concurrent = self.config.get("concurrent", 5)
+        if self.config.get("parallel_streams", False) and concurrent > 1:
+            return f"Starting elephant flows: {concurrent} parallel streams"
+        return f"Starting elephant flows: {concurrent} concurrent"
+    
+    def _client_command(self, port: int, duration: float, streams: int = 1) -> list[str]:
+        """Build the iperf3 client command for an elephant run."""
         # Get bandwidth limit (None/empty means unlimited)
         bandwidth = self.config.get("bandwidth")
         
@@ -320,76 +413,86 @@ class ElephantFlowGenerator:
             "-J",  # JSON output
         ]
         
+        # Several streams in one client; iperf3 applies -b to each stream
+        if streams > 1:
+            cmd.extend(["-P", str(streams)])
+        
         # Add bandwidth limit if specified
         if bandwidth:
             cmd.extend(["-b", str(bandwidth)])
         
+        # Send with sendfile() instead of write() - elephants are bulk transfers
+        if self.config.get("zerocopy", True):
+            cmd.append("-Z")
+        
+        # Fixed socket buffer size; unset leaves the kernel's autotuning in charge
+        window = self.config.get("window")
+        if window:
+            cmd.extend(["-w", str(window)])
+        
+        return cmd
+    
+    async def _run_client(self, cmd: list[str]) -> tuple[bytes, bytes]:
+        """Run an iperf3 client to completion, tracking it for stop()."""
+        proc = await _spawn_iperf3(cmd)
+        self._processes.add(proc)
+        
+        stdout, stderr = await proc.communicate()
+        
+        # Forget the completed process (stop() may already have cleared it)
+        self._processes.discard(proc)
+        return stdout, stderr
+    
+    async def generate_flow(self, duration: float) -> FlowResult:
+        """Generate a single elephant flow."""
+        self.flow_counter += 1
+        flow_id = self.flow_counter
+        port = self.port_allocator()
+        cmd = self._client_command(port, duration)
+        
         start_time = time.time()
         
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            self._processes.append(proc)
-            
-            stdout, stderr = await proc.communicate()
-            
-            # Remove completed process from list
-            if proc in self._processes:
-                self._processes.remove(proc)
+            stdout, stderr = await self._run_client(cmd)
             
             if stdout:
-                return parse_iperf3_output(stdout.decode(), "elephant", flow_id, port)
+                return parse_iperf3_output(stdout, "elephant", flow_id, port)
             else:
-                return FlowResult(
-                    flow_type="elephant",
-                    flow_id=flow_id,
-                    port=port,
-                    start_time=start_time,
-                    end_time=time.time(),
-                    bytes_transferred=0,
-                    bits_per_second=0,
-                    retransmits=0,
-                    jitter_ms=0,
-                    lost_packets=0,
-                    total_packets=0,
-                    success=False,
-                    error=stderr.decode() if stderr else "No output",
-                )
+                error = stderr.decode() if stderr else "No output"
+                return _failed_result("elephant", flow_id, port, error, start_time=start_time)
         except asyncio.CancelledError:
-            return FlowResult(
-                flow_type="elephant",
-                flow_id=flow_id,
-                port=port,
-                start_time=start_time,
-                end_time=time.time(),
-                bytes_transferred=0,
-                bits_per_second=0,
-                retransmits=0,
-                jitter_ms=0,
-                lost_packets=0,
-                total_packets=0,
-                success=False,
-                error="Cancelled",
-            )
+            return _failed_result("elephant", flow_id, port, "Cancelled", start_time=start_time)
         except Exception as e:
-            return FlowResult(
-                flow_type="elephant",
-                flow_id=flow_id,
-                port=port,
-                start_time=start_time,
-                end_time=time.time(),
-                bytes_transferred=0,
-                bits_per_second=0,
-                retransmits=0,
-                jitter_ms=0,
-                lost_packets=0,
-                total_packets=0,
-                success=False,
-                error=str(e),
-            )
+            return _failed_result("elephant", flow_id, port, str(e), start_time=start_time)
+    
+    async def generate_parallel_flows(self, duration: float, streams: int) -> list[FlowResult]:
+        """Generate several elephant flows as parallel streams of one iperf3 client.
+        
+        Each stream is reported as its own flow, so results look the same as
+        running ``streams`` separate clients, but only one process and one
+        control connection are set up.
+        """
+        flow_ids = range(self.flow_counter + 1, self.flow_counter + streams + 1)
+        self.flow_counter += streams
+        port = self.port_allocator()
+        cmd = self._client_command(port, duration, streams)
+        
+        start_time = time.time()
+        
+        try:
+            stdout, stderr = await self._run_client(cmd)
+            
+            if stdout:
+                return parse_iperf3_streams(stdout, "elephant", flow_ids, port)
+            error = stderr.decode() if stderr else "No output"
+        except asyncio.CancelledError:
+            error = "Cancelled"
+        except Exception as e:
+            error = str(e)
+        return [
+            _failed_result("elephant", flow_id, port, error, start_time=start_time)
+            for flow_id in flow_ids
+        ]
     
     async def run(
         self,
@@ -399,8 +502,7 @@ class ElephantFlowGenerator:
         """Run elephant flow generation for the specified duration."""
         self._running = True
         concurrent = self.config.get("concurrent", 5)
-        
-        console.print(f"[cyan]Starting elephant flows: {concurrent} concurrent[/cyan]")
+        parallel = self.config.get("parallel_streams", False) and concurrent > 1
         
         async def run_flow():
             # Run a single elephant flow for the full duration
@@ -409,8 +511,17 @@ class ElephantFlowGenerator:
                 result = await self.generate_flow(duration)
                 result_callback(result)
         
+        async def run_streams():
+            # One iperf3 client carrying every flow as a -P stream
+            if self._running:
+                for result in await self.generate_parallel_flows(duration, concurrent):
+                    result_callback(result)
+        
         # Start concurrent elephant flows
-        tasks = [asyncio.create_task(run_flow()) for _ in range(concurrent)]
+        if parallel:
+            tasks = [asyncio.create_task(run_streams())]
+        else:
+            tasks = [asyncio.create_task(run_flow()) for _ in range(concurrent)]
         self._tasks.update(tasks)
         
         # Wait for flows to complete naturally (they run for `duration` seconds via iperf3 -t)
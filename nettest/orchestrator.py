@@ -1,14 +1,15 @@
 """Main test orchestrator for coordinating flow generators."""
 
 import asyncio
+import itertools
 import time
-from threading import Lock
 
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 
+from ._fmt import format_bits, format_bytes
 from .flows import MiceFlowGenerator, ElephantFlowGenerator, FlowResult
 from .results import ResultsCollector
 
@@ -21,15 +22,12 @@ class PortAllocator:
     def __init__(self, base_port: int = 5201, num_ports: int = 50):
         self.base_port = base_port
         self.num_ports = num_ports
-        self._current = 0
-        self._lock = Lock()
+        # next() on a C-level count is atomic under the GIL, so no lock is needed
+        self._counter = itertools.count()
     
     def allocate(self) -> int:
         """Allocate the next available port (round-robin)."""
-        with self._lock:
-            port = self.base_port + self._current
-            self._current = (self._current + 1) % self.num_ports
-            return port
+        return self.base_port + next(self._counter) % self.num_ports
 
 
 class TestOrchestrator:
@@ -82,16 +80,16 @@ class TestOrchestrator:
         """Callback for flow results."""
         self.results.add_result(result)
         
+        # success is a bool, so it doubles as a 0/1 increment
+        success = result.success
         if result.flow_type == "mice":
             self._mice_count += 1
-            if result.success:
-                self._mice_success += 1
+            self._mice_success += success
         else:
             self._elephant_count += 1
-            if result.success:
-                self._elephant_success += 1
+            self._elephant_success += success
         
-        if result.success:
+        if success:
             self._total_bytes += result.bytes_transferred
     
     def _create_status_table(self) -> Table:
@@ -109,29 +107,11 @@ class TestOrchestrator:
         table.add_row("Mice Flows", f"{self._mice_success}/{self._mice_count}")
         table.add_row("Elephant Flows", f"{self._elephant_success}/{self._elephant_count}")
         table.add_row("", "")
-        table.add_row("Total Transferred", self._format_bytes(self._total_bytes))
-        table.add_row("Throughput", f"{self._format_bits(self._total_bytes * 8 / elapsed if elapsed > 0 else 0)}/s")
+        table.add_row("Total Transferred", format_bytes(self._total_bytes))
+        table.add_row("Throughput", f"{format_bits(self._total_bytes * 8 / elapsed if elapsed > 0 else 0)}/s")
         
         return table
     
-    @staticmethod
-    def _format_bytes(num_bytes: int) -> str:
-        """Format bytes into human-readable string."""
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if abs(num_bytes) < 1024.0:
-                return f"{num_bytes:.2f} {unit}"
-            num_bytes /= 1024.0
-        return f"{num_bytes:.2f} PB"
-    
-    @staticmethod
-    def _format_bits(bits: float) -> str:
-        """Format bits into human-readable string."""
-        for unit in ["bps", "Kbps", "Mbps", "Gbps"]:
-            if abs(bits) < 1000.0:
-                return f"{bits:.2f} {unit}"
-            bits /= 1000.0
-        return f"{bits:.2f} Tbps"
-    
     async def run(self) -> None:
         """Run the test orchestration."""
         if not self.mice_generator and not self.elephant_generator:
@@ -140,6 +120,10 @@ class TestOrchestrator:
         
         console.print(f"\n[bold green]Starting test: {self.profile.get('name', 'Unnamed')}[/bold green]")
         console.print(f"Duration: {self.duration}s")
+        # Banners go out before the clock starts so terminal I/O stays out of the test window
+        for generator in (self.mice_generator, self.elephant_generator):
+            if generator:
+                console.print(f"[cyan]{generator.describe()}[/cyan]")
         console.print()
         
         self._start_time = time.time()
@@ -162,17 +146,16 @@ class TestOrchestrator:
             )
             generator_tasks.append(("elephant_flow_generator", task))
         
-        # Status update task - exits when status_done is set or duration elapsed
+        # Status display - exits when status_done is set or duration elapsed.
+        # Live's refresh thread builds the table itself at 2 Hz via
+        # get_renderable, so this task only has to wait.
         async def update_status():
-            with Live(self._create_status_table(), refresh_per_second=2, console=console) as live:
-                while not status_done.is_set() and time.time() - self._start_time < self.duration:
-                    # Use wait_for with timeout to check event periodically
-                    try:
-                        await asyncio.wait_for(status_done.wait(), timeout=0.5)
-                        break  # Event was set, exit loop
-                    except asyncio.TimeoutError:
-                        pass  # Timeout, update display and continue
-                    live.update(self._create_status_table())
+            with Live(get_renderable=self._create_status_table, refresh_per_second=2, console=console):
+                remaining = self.duration - (time.time() - self._start_time)
+                try:
+                    await asyncio.wait_for(status_done.wait(), timeout=max(0, remaining))
+                except asyncio.TimeoutError:
+                    pass  # Duration elapsed; leave the final table on screen
         
         status_task = asyncio.create_task(update_status())
         
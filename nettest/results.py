@@ -3,16 +3,44 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from dataclasses import asdict
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from typing import Optional
 
 from rich.console import Console
 from rich.table import Table
 
+from ._fmt import format_bits, format_bytes
 from .flows import FlowResult
 
 console = Console()
 
+# Flow types summarised per category; anything else only counts in the totals
+_FLOW_TYPES = ("mice", "elephant")
+
+# FlowResult field names, in declaration order, and a getter for all of them -
+# a flat record replacement for asdict() when writing the per-flow report
+_FLOW_FIELDS = tuple(f.name for f in fields(FlowResult))
+_flow_values = attrgetter(*_FLOW_FIELDS)
+
+
+@dataclass(slots=True, frozen=True)
+class AggregateStats:
+    """Scalar totals for a test, as reported by ResultsCollector.get_stats."""
+    total_flows: int
+    successful_flows: int
+    total_bytes: int
+    avg_throughput_bps: float
+    total_retransmits: int
+    avg_jitter_ms: float
+    packet_loss_pct: float
+    mice_total: int
+    mice_successful: int
+    mice_bytes: int
+    elephant_total: int
+    elephant_successful: int
+    elephant_bytes: int
+
 
 class ResultsCollector:
     """Collects and aggregates test results."""
@@ -22,6 +50,19 @@ class ResultsCollector:
         self.results: list[FlowResult] = []
         self.test_start: Optional[float] = None
         self.test_end: Optional[float] = None
+        
+        # Per-type views of results and running totals, updated by add_result
+        # so neither the getters nor get_summary have to rescan
+        self._results_by_type: dict[str, list[FlowResult]] = {t: [] for t in _FLOW_TYPES}
+        self._flow_counts = dict.fromkeys(_FLOW_TYPES, 0)
+        self._success_counts = dict.fromkeys(_FLOW_TYPES, 0)
+        self._success_bytes = dict.fromkeys(_FLOW_TYPES, 0)
+        self._retransmits = 0
+        self._throughput_sum = 0
+        self._jitter_sum = 0
+        self._jitter_count = 0
+        self._total_packets = 0
+        self._lost_packets = 0
     
     def set_test_start(self, timestamp: float) -> None:
         """Set the test start time."""
@@ -32,68 +73,94 @@ class ResultsCollector:
         self.test_end = timestamp
     
     def add_result(self, result: FlowResult) -> None:
-        """Add a flow result."""
+        """Add a flow result and fold it into the running totals."""
         self.results.append(result)
+        
+        # Unknown flow types only count towards the overall total
+        flow_type = result.flow_type
+        if flow_type not in self._flow_counts:
+            return
+        self._results_by_type[flow_type].append(result)
+        self._flow_counts[flow_type] += 1
+        if not result.success:
+            return
+        
+        self._success_counts[flow_type] += 1
+        self._success_bytes[flow_type] += result.bytes_transferred
+        self._retransmits += result.retransmits
+        self._throughput_sum += result.bits_per_second
+        # Jitter is only reported by UDP flows
+        if result.jitter_ms > 0:
+            self._jitter_sum += result.jitter_ms
+            self._jitter_count += 1
+        self._total_packets += result.total_packets
+        self._lost_packets += result.lost_packets
     
     def get_mice_results(self) -> list[FlowResult]:
         """Get all mice flow results."""
-        return [r for r in self.results if r.flow_type == "mice"]
+        return list(self._results_by_type["mice"])
     
     def get_elephant_results(self) -> list[FlowResult]:
         """Get all elephant flow results."""
-        return [r for r in self.results if r.flow_type == "elephant"]
+        return list(self._results_by_type["elephant"])
+    
+    def get_stats(self) -> AggregateStats:
+        """Get the aggregate statistics from the running totals.
+        
+        Built from the counters kept by add_result, so the cost does not
+        grow with the number of flows.
+        """
+        successful = self._success_counts["mice"] + self._success_counts["elephant"]
+        total_packets = self._total_packets
+        
+        return AggregateStats(
+            total_flows=len(self.results),
+            successful_flows=successful,
+            total_bytes=self._success_bytes["mice"] + self._success_bytes["elephant"],
+            avg_throughput_bps=self._throughput_sum / successful if successful else 0,
+            total_retransmits=self._retransmits,
+            # Jitter is averaged over the UDP flows that reported it
+            avg_jitter_ms=self._jitter_sum / self._jitter_count if self._jitter_count else 0,
+            packet_loss_pct=(self._lost_packets / total_packets * 100) if total_packets > 0 else 0,
+            mice_total=self._flow_counts["mice"],
+            mice_successful=self._success_counts["mice"],
+            mice_bytes=self._success_bytes["mice"],
+            elephant_total=self._flow_counts["elephant"],
+            elephant_successful=self._success_counts["elephant"],
+            elephant_bytes=self._success_bytes["elephant"],
+        )
     
     def get_summary(self) -> dict:
         """Generate a summary of the test results."""
-        mice = self.get_mice_results()
-        elephants = self.get_elephant_results()
-        
-        mice_successful = [r for r in mice if r.success]
-        elephant_successful = [r for r in elephants if r.success]
-        
-        all_successful = mice_successful + elephant_successful
-        
-        total_bytes = sum(r.bytes_transferred for r in all_successful)
-        total_retransmits = sum(r.retransmits for r in all_successful)
-        
+        stats = self.get_stats()
         duration = (self.test_end - self.test_start) if self.test_start and self.test_end else 0
         
-        # Calculate aggregate throughput
-        avg_throughput = sum(r.bits_per_second for r in all_successful) / len(all_successful) if all_successful else 0
-        
-        # Calculate jitter (for UDP flows)
-        jitter_values = [r.jitter_ms for r in all_successful if r.jitter_ms > 0]
-        avg_jitter = sum(jitter_values) / len(jitter_values) if jitter_values else 0
-        
-        # Calculate packet loss
-        total_packets = sum(r.total_packets for r in all_successful)
-        lost_packets = sum(r.lost_packets for r in all_successful)
-        packet_loss_pct = (lost_packets / total_packets * 100) if total_packets > 0 else 0
-        
         return {
             "test_duration_seconds": duration,
             "mice_flows": {
-                "total": len(mice),
-                "successful": len(mice_successful),
-                "failed": len(mice) - len(mice_successful),
-                "success_rate": len(mice_successful) / len(mice) * 100 if mice else 0,
-                "total_bytes": sum(r.bytes_transferred for r in mice_successful),
+                "total": stats.mice_total,
+                "successful": stats.mice_successful,
+                "failed": stats.mice_total - stats.mice_successful,
+                "success_rate": stats.mice_successful / stats.mice_total * 100 if stats.mice_total else 0,
+                "total_bytes": stats.mice_bytes,
             },
             "elephant_flows": {
-                "total": len(elephants),
-                "successful": len(elephant_successful),
-                "failed": len(elephants) - len(elephant_successful),
-                "success_rate": len(elephant_successful) / len(elephants) * 100 if elephants else 0,
-                "total_bytes": sum(r.bytes_transferred for r in elephant_successful),
+                "total": stats.elephant_total,
+                "successful": stats.elephant_successful,
+                "failed": stats.elephant_total - stats.elephant_successful,
+                "success_rate": (
+                    stats.elephant_successful / stats.elephant_total * 100 if stats.elephant_total else 0
+                ),
+                "total_bytes": stats.elephant_bytes,
             },
             "aggregate": {
-                "total_flows": len(self.results),
-                "successful_flows": len(all_successful),
-                "total_bytes_transferred": total_bytes,
-                "average_throughput_bps": avg_throughput,
-                "total_retransmits": total_retransmits,
-                "average_jitter_ms": avg_jitter,
-                "packet_loss_percent": packet_loss_pct,
+                "total_flows": stats.total_flows,
+                "successful_flows": stats.successful_flows,
+                "total_bytes_transferred": stats.total_bytes,
+                "average_throughput_bps": stats.avg_throughput_bps,
+                "total_retransmits": stats.total_retransmits,
+                "average_jitter_ms": stats.avg_jitter_ms,
+                "packet_loss_percent": stats.packet_loss_pct,
             },
         }
     
@@ -116,7 +183,7 @@ class ResultsCollector:
         mice_table.add_row("Successful", str(mice_data["successful"]))
         mice_table.add_row("Failed", str(mice_data["failed"]))
         mice_table.add_row("Success Rate", f"{mice_data['success_rate']:.1f}%")
-        mice_table.add_row("Data Transferred", self._format_bytes(mice_data["total_bytes"]))
+        mice_table.add_row("Data Transferred", format_bytes(mice_data["total_bytes"]))
         console.print(mice_table)
         console.print()
         
@@ -129,7 +196,7 @@ class ResultsCollector:
         elephant_table.add_row("Successful", str(elephant_data["successful"]))
         elephant_table.add_row("Failed", str(elephant_data["failed"]))
         elephant_table.add_row("Success Rate", f"{elephant_data['success_rate']:.1f}%")
-        elephant_table.add_row("Data Transferred", self._format_bytes(elephant_data["total_bytes"]))
+        elephant_table.add_row("Data Transferred", format_bytes(elephant_data["total_bytes"]))
         console.print(elephant_table)
         console.print()
         
@@ -141,47 +208,38 @@ class ResultsCollector:
         agg_table.add_row("Test Duration", f"{summary['test_duration_seconds']:.1f}s")
         agg_table.add_row("Total Flows", str(agg_data["total_flows"]))
         agg_table.add_row("Successful Flows", str(agg_data["successful_flows"]))
-        agg_table.add_row("Total Data", self._format_bytes(agg_data["total_bytes_transferred"]))
-        agg_table.add_row("Avg Throughput", self._format_bits(agg_data["average_throughput_bps"]) + "/s")
+        agg_table.add_row("Total Data", format_bytes(agg_data["total_bytes_transferred"]))
+        agg_table.add_row("Avg Throughput", format_bits(agg_data["average_throughput_bps"]) + "/s")
         agg_table.add_row("Total Retransmits", str(agg_data["total_retransmits"]))
         agg_table.add_row("Avg Jitter", f"{agg_data['average_jitter_ms']:.2f}ms")
         agg_table.add_row("Packet Loss", f"{agg_data['packet_loss_percent']:.2f}%")
         console.print(agg_table)
     
     def save_report(self) -> Path:
-        """Save the results to a JSON file."""
+        """Save the results to a JSON file.
+        
+        The summary keeps the indented layout; flows are written one compact
+        object per line as they are encoded, so no list of per-flow dicts is
+        built in memory first.
+        """
         now = datetime.now()
         filename = f"test_results_{now.strftime('%Y%m%d_%H%M%S')}.json"
         filepath = self.output_dir / filename
         
-        report = {
-            "timestamp": now.isoformat(),
-            "summary": self.get_summary(),
-            "flows": [asdict(r) for r in self.results],
-        }
+        header = json.dumps({"timestamp": now.isoformat(), "summary": self.get_summary()}, indent=2)
         
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         with open(filepath, "w") as f:
-            json.dump(report, f, indent=2)
+            # Reopen the header object (drop its closing "\n}") to append the flows
+            f.write(header[:-2])
+            f.write(',\n  "flows": [')
+            separator = "\n    "
+            for r in self.results:
+                f.write(separator)
+                f.write(json.dumps(dict(zip(_FLOW_FIELDS, _flow_values(r)))))
+                separator = ",\n    "
+            f.write("\n  ]\n}\n" if self.results else "]\n}\n")
         
         return filepath
-    
-    @staticmethod
-    def _format_bytes(num_bytes: int) -> str:
-        """Format bytes into human-readable string."""
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if abs(num_bytes) < 1024.0:
-                return f"{num_bytes:.2f} {unit}"
-            num_bytes /= 1024.0
-        return f"{num_bytes:.2f} PB"
-    
-    @staticmethod
-    def _format_bits(bits: float) -> str:
-        """Format bits into human-readable string."""
-        for unit in ["bps", "Kbps", "Mbps", "Gbps"]:
-            if abs(bits) < 1000.0:
-                return f"{bits:.2f} {unit}"
-            bits /= 1000.0
-        return f"{bits:.2f} Tbps"
@@ -7,22 +7,43 @@ such as different client counts, to analyze performance under different loads.
 import asyncio
 import json
 import time
-from dataclasses import dataclass, field, asdict
+from bisect import bisect_right
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable
-import copy
 
 import yaml
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
+from ._fmt import format_bits
 from .orchestrator import TestOrchestrator, PortAllocator
 from .results import ResultsCollector
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 console = Console()
 
+# Success-rate styles in the sweep comparison: below 80% red, below 95%
+# yellow, otherwise green
+_SUCCESS_STYLE_BOUNDS = (80, 95)
+_SUCCESS_STYLES = ("red", "yellow", "green")
+
+# Timestamp in sweep file names, e.g. sweep_<name>_20250115_120000.json
+_FILE_STAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Sweep files stay indented for reading by hand; orjson, when installed,
+# encodes them in C
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 if orjson is not None else 0
+
+# Use the libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class ClientProfile:
@@ -68,7 +89,7 @@ class ScenarioConfig:
             raise FileNotFoundError(f"Scenario file not found: {yaml_path}")
 
         with open(path) as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_YamlLoader) or {}
 
         return cls.from_dict(data)
 
@@ -157,14 +178,24 @@ class SweepResult:
             "results": [asdict(r) for r in self.results],
         }
 
-    def save(self, output_dir: Path) -> Path:
-        """Save sweep results to JSON file."""
+    def save(self, output_dir: Path, stamp: Optional[str] = None) -> Path:
+        """Save sweep results to JSON file.
+
+        Args:
+            output_dir: Directory to write into
+            stamp: Timestamp used in the file name (default: now)
+        """
         output_dir.mkdir(parents=True, exist_ok=True)
-        filename = f"sweep_{self.sweep_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        stamp = stamp or datetime.now().strftime(_FILE_STAMP_FORMAT)
+        filename = f"sweep_{self.sweep_name}_{stamp}.json"
         filepath = output_dir / filename
 
-        with open(filepath, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        data = self.to_dict()
+        if orjson is not None:
+            filepath.write_bytes(orjson.dumps(data, option=_ORJSON_OPTIONS))
+        else:
+            with open(filepath, "w") as f:
+                json.dump(data, f, indent=2)
 
         return filepath
 
@@ -277,37 +308,36 @@ class ScenarioRunner:
             emulator.clear()
 
         # Collect results
-        summary = results.get_summary()
+        stats = results.get_stats()
+        total_flows = stats.total_flows
+        successful_flows = stats.successful_flows
+        total_bytes = stats.total_bytes
+        num_clients = config.num_clients
+        total_throughput_bps = total_bytes * 8 / config.duration
 
         scenario_result = ScenarioResult(
             scenario_name=config.name,
-            num_clients=config.num_clients,
+            num_clients=num_clients,
             duration=config.duration,
             timestamp=datetime.now().isoformat(),
             environment=config.environment_preset or config.environment,
-            total_flows=summary["aggregate"]["total_flows"],
-            successful_flows=summary["aggregate"]["successful_flows"],
-            failed_flows=summary["aggregate"]["total_flows"] - summary["aggregate"]["successful_flows"],
-            success_rate=(
-                summary["aggregate"]["successful_flows"] / summary["aggregate"]["total_flows"] * 100
-                if summary["aggregate"]["total_flows"] > 0
-                else 0
-            ),
-            total_bytes=summary["aggregate"]["total_bytes_transferred"],
-            avg_throughput_bps=summary["aggregate"]["average_throughput_bps"],
-            total_throughput_bps=summary["aggregate"]["total_bytes_transferred"] * 8 / config.duration,
-            avg_jitter_ms=summary["aggregate"]["average_jitter_ms"],
-            packet_loss_pct=summary["aggregate"]["packet_loss_percent"],
-            total_retransmits=summary["aggregate"]["total_retransmits"],
-            flows_per_client=summary["aggregate"]["total_flows"] / config.num_clients,
-            bytes_per_client=summary["aggregate"]["total_bytes_transferred"] / config.num_clients,
-            throughput_per_client_bps=(
-                summary["aggregate"]["total_bytes_transferred"] * 8 / config.duration / config.num_clients
-            ),
-            mice_flows=summary["mice_flows"]["total"],
-            mice_success=summary["mice_flows"]["successful"],
-            elephant_flows=summary["elephant_flows"]["total"],
-            elephant_success=summary["elephant_flows"]["successful"],
+            total_flows=total_flows,
+            successful_flows=successful_flows,
+            failed_flows=total_flows - successful_flows,
+            success_rate=successful_flows / total_flows * 100 if total_flows > 0 else 0,
+            total_bytes=total_bytes,
+            avg_throughput_bps=stats.avg_throughput_bps,
+            total_throughput_bps=total_throughput_bps,
+            avg_jitter_ms=stats.avg_jitter_ms,
+            packet_loss_pct=stats.packet_loss_pct,
+            total_retransmits=stats.total_retransmits,
+            flows_per_client=total_flows / num_clients,
+            bytes_per_client=total_bytes / num_clients,
+            throughput_per_client_bps=total_throughput_bps / num_clients,
+            mice_flows=stats.mice_total,
+            mice_success=stats.mice_successful,
+            elephant_flows=stats.elephant_total,
+            elephant_success=stats.elephant_successful,
         )
 
         return scenario_result
@@ -330,46 +360,90 @@ class ScenarioRunner:
         Returns:
             SweepResult with all scenario results
         """
+        started = datetime.now()
         sweep = SweepResult(
             sweep_name=base_config.name,
             parameter_name="num_clients",
             parameter_values=client_counts,
-            timestamp=datetime.now().isoformat(),
+            timestamp=started.isoformat(),
         )
 
+        # Each finished scenario is also appended to a line-delimited sidecar,
+        # so a sweep that is interrupted keeps the points it completed. It
+        # shares its name stamp with the final sweep file.
+        stamp = started.strftime(_FILE_STAMP_FORMAT)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        partial_path = self.output_dir / f"sweep_{base_config.name}_{stamp}.ndjson"
+
         console.print(f"\n[bold green]Starting client count sweep[/bold green]")
         console.print(f"  Testing: {client_counts} clients")
         console.print(f"  Total scenarios: {len(client_counts)}")
+        console.print(f"  Per-scenario results: {partial_path}")
         console.print()
 
+        with open(partial_path, "wb") as partial:
+            await self._run_sweep_points(
+                sweep, base_config, client_counts, apply_environment, delay_between, partial
+            )
+
+        # Print comparison
+        self._print_sweep_comparison(sweep)
+
+        # Save results
+        filepath = sweep.save(self.output_dir, stamp)
+        console.print(f"\n[green]Sweep results saved to: {filepath}[/green]")
+
+        # The saved file holds every point, so the sidecar is redundant now
+        partial_path.unlink(missing_ok=True)
+
+        return sweep
+
+    async def _run_sweep_points(
+        self,
+        sweep: SweepResult,
+        base_config: ScenarioConfig,
+        client_counts: list[int],
+        apply_environment: bool,
+        delay_between: int,
+        partial,
+    ) -> None:
+        """Run each client count of a sweep, recording results as they finish.
+
+        Args:
+            sweep: Sweep whose results list is appended to
+            base_config: Base scenario configuration
+            client_counts: Client counts to test, in order
+            apply_environment: Whether to apply network environment
+            delay_between: Seconds to wait between scenarios
+            partial: Binary file each result is written to as one JSON line
+        """
         for i, num_clients in enumerate(client_counts):
-            # Create config for this iteration
-            config = copy.deepcopy(base_config)
-            config.num_clients = num_clients
-            config.name = f"{base_config.name} ({num_clients} clients)"
+            # Create config for this iteration (client_profile is only read, so it is shared)
+            config = replace(
+                base_config,
+                num_clients=num_clients,
+                name=f"{base_config.name} ({num_clients} clients)",
+            )
 
             console.print(f"\n[bold]═══ Scenario {i + 1}/{len(client_counts)}: {num_clients} clients ═══[/bold]")
 
             # Run scenario
             result = await self.run_scenario(config, apply_environment)
+            scenario_end = time.monotonic()
             sweep.results.append(result)
+            partial.write(_encode_result_line(result))
+            partial.flush()
 
             # Print quick summary
             self._print_scenario_summary(result)
 
-            # Wait between scenarios
+            # Wait between scenarios, counted from the end of the last one so
+            # time already spent on the summary isn't slept again
             if i < len(client_counts) - 1:
                 console.print(f"\n[dim]Waiting {delay_between}s before next scenario...[/dim]")
-                await asyncio.sleep(delay_between)
-
-        # Print comparison
-        self._print_sweep_comparison(sweep)
-
-        # Save results
-        filepath = sweep.save(self.output_dir)
-        console.print(f"\n[green]Sweep results saved to: {filepath}[/green]")
-
-        return sweep
+                remaining = delay_between - (time.monotonic() - scenario_end)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
 
     def _print_scenario_summary(self, result: ScenarioResult) -> None:
         """Print a quick summary of scenario results."""
@@ -379,8 +453,8 @@ class ScenarioRunner:
 
         table.add_row("Total Flows", str(result.total_flows))
         table.add_row("Success Rate", f"{result.success_rate:.1f}%")
-        table.add_row("Total Throughput", self._format_bits(result.total_throughput_bps) + "/s")
-        table.add_row("Per-Client Throughput", self._format_bits(result.throughput_per_client_bps) + "/s")
+        table.add_row("Total Throughput", format_bits(result.total_throughput_bps) + "/s")
+        table.add_row("Per-Client Throughput", format_bits(result.throughput_per_client_bps) + "/s")
         table.add_row("Retransmits", str(result.total_retransmits))
 
         console.print(table)
@@ -400,13 +474,14 @@ class ScenarioRunner:
         table.add_column("Retransmits", justify="right")
 
         for result in sweep.results:
-            success_style = "green" if result.success_rate >= 95 else "yellow" if result.success_rate >= 80 else "red"
+            success_rate = result.success_rate
+            success_style = _SUCCESS_STYLES[bisect_right(_SUCCESS_STYLE_BOUNDS, success_rate)]
             table.add_row(
                 str(result.num_clients),
                 str(result.total_flows),
-                f"[{success_style}]{result.success_rate:.1f}%[/{success_style}]",
-                self._format_bits(result.total_throughput_bps) + "/s",
-                self._format_bits(result.throughput_per_client_bps) + "/s",
+                f"[{success_style}]{success_rate:.1f}%[/{success_style}]",
+                format_bits(result.total_throughput_bps) + "/s",
+                format_bits(result.throughput_per_client_bps) + "/s",
                 str(result.total_retransmits),
             )
 
@@ -440,14 +515,12 @@ class ScenarioRunner:
             else:
                 console.print(f"  [green]No breaking point detected (success > 90% throughout)[/green]")
 
-    @staticmethod
-    def _format_bits(bits: float) -> str:
-        """Format bits into human-readable string."""
-        for unit in ["bps", "Kbps", "Mbps", "Gbps"]:
-            if abs(bits) < 1000.0:
-                return f"{bits:.2f} {unit}"
-            bits /= 1000.0
-        return f"{bits:.2f} Tbps"
+
+def _encode_result_line(result: ScenarioResult) -> bytes:
+    """Encode a scenario result as one newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(asdict(result)) + "\n").encode()
 
 
 def load_scenario(path: str) -> ScenarioConfig:
@@ -7,6 +7,8 @@ from typing import Optional
 from rich.console import Console
 from rich.table import Table
 
+from .flows import iperf3_executable
+
 console = Console()
 
 
@@ -21,13 +23,17 @@ class IperfServer:
     async def start(self) -> bool:
         """Start the iperf3 server."""
         try:
+            # Resolved path + close_fds=False lets CPython use posix_spawn()
+            # for the restart after every connection instead of fork()+exec()
             self.process = await asyncio.create_subprocess_exec(
                 "iperf3",
                 "-s",  # Server mode
                 "-p", str(self.port),
                 "-1",  # One-off mode (exit after one connection)
+                executable=iperf3_executable(),
                 stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.DEVNULL,
+                close_fds=False,
             )
             self._running = True
             return True
@@ -36,15 +42,19 @@ class IperfServer:
             return False
     
     async def run_forever(self) -> None:
-        """Keep restarting the server after each connection."""
+        """Keep restarting the server after each connection.
+        
+        An instance already launched with start() is waited on first
+        rather than started a second time.
+        """
         self._running = True
         while self._running:
-            if not await self.start():
-                await asyncio.sleep(1)
-                continue
+            if self.process is None or self.process.returncode is not None:
+                if not await self.start():
+                    await asyncio.sleep(1)
+                    continue
             
-            if self.process:
-                await self.process.wait()
+            await self.process.wait()
     
     def stop(self) -> None:
         """Stop the server."""
@@ -95,7 +105,8 @@ class ServerPool:
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, self.stop)
         
-        # Start all servers
+        # Launch every server up front so the spawns overlap, then supervise
+        await asyncio.gather(*(server.start() for server in self.servers))
         tasks = [
             asyncio.create_task(server.run_forever())
             for server in self.servers